@@ -0,0 +1,91 @@
+"""Measure the memory taken by tokens and AST nodes of a large generated program.
+
+Slotted nodes are compared against dict-backed copies of the same tree, built
+from subclasses that do not declare __slots__ and so get a per-instance
+__dict__ back.
+
+    python benchmarks/ast_memory.py [number_of_functions]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import ast_nodes
+from lexer import Lexer
+from parser import Parser
+from token_types import Token
+
+
+def generate_program(functions):
+    lines = []
+    for i in range(functions):
+        lines.append(
+            f"func f{i}(n, acc) = if n == 0 then acc "
+            f"else let m = n - 1 in #f{i}(m, acc + n * {i} / (1 + {i % 7}))"
+        )
+    return '\n'.join(lines)
+
+
+DICT_CLASSES = {
+    cls: type(f'Dict{cls.__name__}', (cls,), {})
+    for cls in vars(ast_nodes).values()
+    if isinstance(cls, type) and issubclass(cls, ast_nodes.ASTNode) and cls is not ast_nodes.ASTNode
+}
+DictToken = type('DictToken', (Token,), {})
+
+
+def copy_tree(node, classes=None):
+    """Rebuild a tree, optionally swapping each node class through ``classes``."""
+    if isinstance(node, list):
+        return [copy_tree(item, classes) for item in node]
+    if not isinstance(node, ast_nodes.ASTNode):
+        return node
+    cls = classes[type(node)] if classes else type(node)
+    copy = cls.__new__(cls)
+    for field in type(node).__slots__:
+        setattr(copy, field, copy_tree(getattr(node, field), classes))
+    return copy
+
+
+def count_nodes(node):
+    if isinstance(node, list):
+        return sum(count_nodes(item) for item in node)
+    if not isinstance(node, ast_nodes.ASTNode):
+        return 0
+    return 1 + sum(count_nodes(getattr(node, field)) for field in type(node).__slots__)
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    source = generate_program(functions)
+    tokens = Lexer(source).tokenize()
+    program = [node for _, node in Parser.from_source(source).parse_program()]
+    nodes = count_nodes(program)
+
+    _, slotted_tokens = measure(lambda: [Token(t.type, t.value, t.position, t.line) for t in tokens])
+    _, dict_tokens = measure(lambda: [DictToken(t.type, t.value, t.position, t.line) for t in tokens])
+    _, slotted_nodes = measure(lambda: copy_tree(program))
+    _, dict_nodes = measure(lambda: copy_tree(program, DICT_CLASSES))
+
+    print(f"Program: {len(source):,} chars, {len(tokens):,} tokens, {nodes:,} AST nodes")
+    print(f"{'':<8}{'dict (bytes/item)':>20}{'slots (bytes/item)':>20}{'saved':>10}")
+    for label, dict_size, slot_size, count in (
+            ("tokens", dict_tokens, slotted_tokens, len(tokens)),
+            ("nodes", dict_nodes, slotted_nodes, nodes)):
+        print(f"{label:<8}{dict_size / count:>20.1f}{slot_size / count:>20.1f}"
+              f"{1 - slot_size / dict_size:>10.0%}")
+
+
+if __name__ == '__main__':
+    main()
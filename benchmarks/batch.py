@@ -0,0 +1,88 @@
+"""Per-row cost of applying one NITLang function to many input rows.
+
+Compares parsing and interpreting a '#score(a, b)' call per row, reusing a
+FunctionCall AST whose arguments are replaced per row,
+Interpreter.call_batch and, with NumPy installed, the vectorized backend
+on a million rows. The per-row overhead is the time on top of a
+function whose body is a single number.
+
+    python benchmarks/batch.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ast_nodes import FunctionCall, Number
+from interpreter import Interpreter
+from lexer import Lexer
+from parser import Parser
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ROWS = 20000
+SCORE = "func score(a, b) = if a == b then 0 else a * 3 + b / 2"
+CONSTANT = "func score(a, b) = 1"
+
+
+def per_row_source(interpreter, a, b):
+    return [interpreter.interpret(Parser(Lexer(f"#score({x}, {y})").tokens()).parse())
+            for x, y in zip(a, b)]
+
+
+def per_row_ast(interpreter, a, b):
+    node = FunctionCall('score', [Number(0), Number(0)])
+    results = []
+    for x, y in zip(a, b):
+        node.arguments[0].value = x
+        node.arguments[1].value = y
+        results.append(interpreter.interpret(node))
+    return results
+
+
+def batch(interpreter, a, b):
+    return interpreter.call_batch('score', [a, b])
+
+
+def timed(function, interpreter, a, b):
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        function(interpreter, a, b)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(a) * 1e6
+
+
+def main():
+    a = list(range(ROWS))
+    b = [(i * 7) % 13 for i in range(ROWS)]
+    interpreters = {}
+    for label, source in (('score', SCORE), ('constant', CONSTANT)):
+        interpreter = Interpreter()
+        interpreter.interpret(Parser(Lexer(source).tokens()).parse())
+        interpreters[label] = interpreter
+
+    print(f"{'strategy':<14}{'us/row':>10}{'overhead us/row':>18}")
+    for function in (per_row_source, per_row_ast, batch):
+        total = timed(function, interpreters['score'], a, b)
+        overhead = timed(function, interpreters['constant'], a, b)
+        print(f"{function.__name__:<14}{total:>10.2f}{overhead:>18.2f}")
+    if np is not None:
+        columns = np.array(a), np.array(b)
+        total = timed(batch, interpreters['score'], *columns)
+        print(f"{'batch (numpy)':<14}{total:>10.2f}")
+
+        vector = Interpreter(vectorize=True)
+        vector.interpret(Parser(Lexer(SCORE).tokens()).parse())
+        rows = np.arange(1000000)
+        total = timed(batch, vector, rows, (rows * 7) % 13)
+        print(f"{'vectorized':<14}{total:>10.4f}   ({1 / total:,.1f} M rows/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Microbenchmark of per-node dispatch cost in Interpreter.visit.
+
+Compares the type-keyed dispatch table against the previous approach of
+formatting 'visit_<ClassName>' and calling getattr for every node.
+
+    python benchmarks/dispatch.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from interpreter import Interpreter
+from lexer import Lexer
+from parser import Parser
+
+
+class GetattrInterpreter(Interpreter):
+    def visit(self, node):
+        method_name = f'visit_{type(node).__name__}'
+        method = getattr(self, method_name, self.generic_visit)
+        return method(node)
+
+
+def count_visits(interpreter, tree):
+    counter = [0]
+    original = type(interpreter).visit
+
+    class Counting(type(interpreter)):
+        def visit(self, node):
+            counter[0] += 1
+            return original(self, node)
+
+    interpreter.__class__ = Counting
+    try:
+        interpreter.interpret(tree)
+    finally:
+        interpreter.__class__ = Counting.__bases__[0]
+    return counter[0]
+
+
+def main():
+    setup = "func fib(n) = if n == 0 then 0 else if n == 1 then 1 else #fib(n - 1) + #fib(n - 2)"
+    workload = Parser(Lexer("#fib(15)").tokens()).parse()
+    number = 5
+
+    results = {}
+    for cls in (GetattrInterpreter, Interpreter):
+        interpreter = cls()
+        interpreter.interpret(Parser(Lexer(setup).tokens()).parse())
+        visits = count_visits(interpreter, workload)
+        seconds = min(timeit.repeat(lambda: interpreter.interpret(workload), number=number, repeat=5))
+        results[cls.__name__] = seconds / number / visits * 1e9
+        print(f"{cls.__name__:<20}{visits:>10,} visits/run{results[cls.__name__]:>10.1f} ns/visit")
+    before, after = results['GetattrInterpreter'], results['Interpreter']
+    print(f"dispatch table saves {before - after:.1f} ns per node ({1 - after / before:.0%})")
+
+
+if __name__ == '__main__':
+    main()
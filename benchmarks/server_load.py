@@ -0,0 +1,93 @@
+"""Load test for the evaluation server: requests per second and latency.
+
+Opens CLIENTS concurrent connections, each defining a function and then
+sending REQUESTS statements one after another, and reports throughput and
+the p50/p99 round-trip latency. Without --host/--port/--unix an in-process
+server is started for the run.
+
+    python benchmarks/server_load.py                        # 16 clients x 200 requests
+    python benchmarks/server_load.py -c 64 -n 500 --workers 8
+    python benchmarks/server_load.py --port 7777            # against a running server
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from server import EvaluationServer
+
+SETUP = "func fib(n) = if n == 0 then 0 else if n == 1 then 1 else #fib(n - 1) + #fib(n - 2)"
+STATEMENTS = ["1 + 2 * 3", "#fib(10)", "let x = #fib(12) in x / 2", "#fib(15)"]
+
+
+async def client(index, connect, requests, latencies):
+    reader, writer = await connect()
+    try:
+        for i in range(requests + 1):
+            text = SETUP if i == 0 else STATEMENTS[(index + i) % len(STATEMENTS)]
+            start = time.perf_counter()
+            writer.write(text.encode('utf-8') + b'\n')
+            await writer.drain()
+            reply = await reader.readline()
+            if i:
+                latencies.append(time.perf_counter() - start)
+            if not reply.startswith(b'OK'):
+                raise Exception(f"client {index}: {text!r} -> {reply.decode('utf-8').strip()!r}")
+    finally:
+        writer.close()
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def run(args):
+    server = None
+    if args.unix:
+        connect = lambda: asyncio.open_unix_connection(args.unix)
+    elif args.port:
+        connect = lambda: asyncio.open_connection(args.host, args.port)
+    else:
+        server = EvaluationServer(args.engine, workers=args.workers, timeout=args.timeout)
+        await server.start()
+        host, port = server.address[:2]
+        connect = lambda: asyncio.open_connection(host, port)
+
+    latencies = []
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(i, connect, args.requests, latencies)
+                               for i in range(args.clients)))
+        elapsed = time.perf_counter() - start
+    finally:
+        if server is not None:
+            await server.close()
+
+    print(f"{args.clients} clients x {args.requests} requests in {elapsed:.2f}s")
+    print(f"{'requests/s':<12}{len(latencies) / elapsed:>12,.1f}")
+    print(f"{'p50 ms':<12}{percentile(latencies, 0.50) * 1e3:>12.2f}")
+    print(f"{'p99 ms':<12}{percentile(latencies, 0.99) * 1e3:>12.2f}")
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="NITLang server load test")
+    arg_parser.add_argument('-c', '--clients', type=int, default=16, help="concurrent connections (default: 16)")
+    arg_parser.add_argument('-n', '--requests', type=int, default=200,
+                            help="requests per connection (default: 200)")
+    arg_parser.add_argument('--host', default='127.0.0.1', help="server host (default: 127.0.0.1)")
+    arg_parser.add_argument('--port', type=int, help="connect to a running server on this port")
+    arg_parser.add_argument('--unix', metavar='PATH', help="connect to a running server on this Unix socket")
+    arg_parser.add_argument('--engine', default='tree', help="engine of the in-process server (default: tree)")
+    arg_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="evaluation slots of the in-process server (default: CPU count)")
+    arg_parser.add_argument('--timeout', type=float, default=30.0,
+                            help="per-request timeout of the in-process server (default: 30)")
+    asyncio.run(run(arg_parser.parse_args(argv)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+"""Throughput benchmarks for the lexer, parser, interpreter and run_file.
+
+Each benchmark reports operations per second: tokens for the lexer, AST
+nodes for the parser, user-function calls for the interpreter and
+statements for run_file. Results are written as JSON and compared against
+a stored baseline; a benchmark whose throughput drops by more than the
+threshold is reported as a regression and the runner exits with status 1.
+
+    python benchmarks/suite.py                      # run and compare to baseline.json
+    python benchmarks/suite.py -k fib -o out.json   # run a subset, save results
+    python benchmarks/suite.py --update-baseline    # record a new baseline
+
+Baselines are only comparable on the machine that recorded them.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ast_nodes import ASTNode
+from interpreter import Interpreter
+from lexer import Lexer
+from parser import Parser
+from stack_interpreter import StackInterpreter
+from main import run_file
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+FACT = "func fact(n) = if n == 0 then 1 else n * #fact(n - 1)"
+SUM = "func sum(n) = if n == 0 then 0 else n + #sum(n - 1)"
+FIB = "func fib(n) = if n == 0 then 0 else if n == 1 then 1 else #fib(n - 1) + #fib(n - 2)"
+
+
+def arithmetic_chain(terms):
+    operators = ['+', '-', '*', '/']
+    parts = ['1']
+    for i in range(1, terms):
+        parts.append(f"{operators[i % 4]} {i % 7 + 1}")
+    return ' '.join(parts)
+
+
+def let_tower(depth):
+    return ''.join(f"let v{i} = {i} in " for i in range(depth)) + ' + '.join(
+        f"v{i}" for i in range(0, depth, 10))
+
+
+def generated_script(functions):
+    lines = ["# generated benchmark script", "let base = 3"]
+    for i in range(functions):
+        lines.append(f"func f{i}(a, b) = if a == 0 then b else #f{i}(a - 1, b + base * {i % 5 + 1})")
+        lines.append(f"let r{i} = #f{i}({i % 20}, {i})")
+        lines.append(f"#f{i}(r{i} / (base + 1), {arithmetic_chain(8)})")
+    return '\n'.join(lines) + '\n'
+
+
+def count_nodes(node):
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, ASTNode):
+            count += 1
+            stack.extend(getattr(node, slot) for slot in type(node).__slots__
+                         if slot not in ('slot', 'frame_size'))
+    return count
+
+
+def parse_all(source):
+    return [node for _, node in Parser.from_source(source).statements()]
+
+
+def lexer_benchmark(source):
+    tokens = len(Lexer(source).tokenize())
+    return tokens, lambda: Lexer(source).tokenize()
+
+
+def parser_benchmark(source):
+    tokens = Lexer(source).tokenize()
+    nodes = sum(count_nodes(node) for node in parse_all(source))
+    return nodes, lambda: Parser(tokens).parse_program()
+
+
+def interpreter_benchmark(setup, code, unit='calls', engine=Interpreter):
+    """Time ``code`` after running ``setup``, counting user calls or the nodes of ``setup``."""
+    interpreter = engine()
+    for node in parse_all(setup):
+        interpreter.interpret(node)
+    tree = Parser(Lexer(code).tokenize()).parse()
+    if unit == 'nodes':
+        operations = sum(count_nodes(node) for node in parse_all(setup))
+    else:
+        profiled = Interpreter(profile=True)
+        for node in parse_all(setup):
+            profiled.interpret(node)
+        profiled.interpret(tree)
+        operations = sum(row['calls'] for row in profiled.profiler.results())
+    return operations, lambda: interpreter.interpret(tree)
+
+
+def jit_interpreter():
+    return Interpreter(jit=True)
+
+
+def run_file_benchmark(source):
+    handle, path = tempfile.mkstemp(suffix='.nit')
+    with os.fdopen(handle, 'w', encoding='utf-8') as f:
+        f.write(source)
+    statements = len(parse_all(source))
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_file(path)
+    return statements, run, lambda: os.unlink(path)
+
+
+BENCHMARKS = {
+    'lexer/script': ('tokens', lambda: lexer_benchmark(generated_script(200))),
+    'lexer/arithmetic_chain': ('tokens', lambda: lexer_benchmark(arithmetic_chain(5000))),
+    'parser/script': ('nodes', lambda: parser_benchmark(generated_script(200))),
+    'parser/arithmetic_chain': ('nodes', lambda: parser_benchmark(arithmetic_chain(5000))),
+    'parser/let_tower': ('nodes', lambda: parser_benchmark(let_tower(300))),
+    'interpreter/fact': ('calls', lambda: interpreter_benchmark(FACT, "#fact(300)")),
+    'interpreter/sum': ('calls', lambda: interpreter_benchmark(SUM, "#sum(300)")),
+    'interpreter/fib': ('calls', lambda: interpreter_benchmark(FIB, "#fib(16)")),
+    'interpreter/arithmetic_chain': ('nodes', lambda: interpreter_benchmark(
+        "func chain(x) = " + arithmetic_chain(2000).replace('1 ', 'x ', 1), "#chain(5)", 'nodes')),
+    'interpreter/let_tower': ('nodes', lambda: interpreter_benchmark(
+        "func tower(x) = " + let_tower(300), "#tower(0)", 'nodes')),
+    'stack/fib': ('calls', lambda: interpreter_benchmark(FIB, "#fib(16)", engine=StackInterpreter)),
+    'stack/sum': ('calls', lambda: interpreter_benchmark(SUM, "#sum(300)", engine=StackInterpreter)),
+    'jit/fib': ('calls', lambda: interpreter_benchmark(FIB, "#fib(16)", engine=jit_interpreter)),
+    'jit/sum': ('calls', lambda: interpreter_benchmark(SUM, "#sum(300)", engine=jit_interpreter)),
+    'run_file/script': ('statements', lambda: run_file_benchmark(generated_script(200))),
+}
+
+
+def measure(setup, min_time, repeat):
+    prepared = setup()
+    operations, workload = prepared[0], prepared[1]
+    try:
+        workload()
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                workload()
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+            number *= 2
+        best = elapsed / number
+        for _ in range(repeat - 1):
+            start = time.perf_counter()
+            for _ in range(number):
+                workload()
+            best = min(best, (time.perf_counter() - start) / number)
+    finally:
+        if len(prepared) > 2:
+            prepared[2]()
+    return operations, best
+
+
+def run_benchmarks(names, min_time=0.2, repeat=3):
+    results = {}
+    for name in names:
+        unit, setup = BENCHMARKS[name]
+        operations, seconds = measure(setup, min_time, repeat)
+        results[name] = {'unit': unit, 'operations': operations, 'seconds': seconds,
+                         'per_second': operations / seconds}
+        print(f"{name:<30}{operations / seconds:>14,.0f} {unit}/s{seconds * 1000:>12.3f} ms/run")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return the benchmarks whose throughput fell more than ``threshold`` below the baseline."""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        change = result['per_second'] / previous['per_second'] - 1
+        marker = ''
+        if change < -threshold:
+            regressions.append(name)
+            marker = '  REGRESSION'
+        print(f"{name:<30}{change:>+10.1%}{marker}")
+    return regressions
+
+
+def main(argv=None):
+    # Deep #fact/#sum recursion and long left-nested chains are evaluated
+    # recursively by the tree interpreter.
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 20000))
+    arg_parser = argparse.ArgumentParser(description="NITLang benchmark suite")
+    arg_parser.add_argument('-k', dest='pattern', default='',
+                            help="only run benchmarks whose name contains PATTERN")
+    arg_parser.add_argument('-o', '--output', help="write results as JSON to this file")
+    arg_parser.add_argument('--baseline', default=BASELINE, help="baseline JSON to compare against")
+    arg_parser.add_argument('--threshold', type=float, default=0.15,
+                            help="allowed throughput drop before flagging a regression (default: 0.15)")
+    arg_parser.add_argument('--min-time', type=float, default=0.2,
+                            help="minimum seconds per timing run (default: 0.2)")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="timing runs per benchmark (default: 3)")
+    arg_parser.add_argument('--update-baseline', action='store_true',
+                            help="store these results as the new baseline")
+    args = arg_parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if args.pattern in name]
+    results = run_benchmarks(names, args.min_time, args.repeat)
+    report = {'python': platform.python_version(), 'machine': platform.machine(),
+              'benchmarks': results}
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)['benchmarks']
+    print()
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
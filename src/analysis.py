@@ -0,0 +1,64 @@
+from ast_nodes import (Number, BinaryOp, Identifier, FunctionDef,
+                       FunctionCall, IfExpr, Comparison, LetStatement, LetExpression, Block)
+
+
+class Dependencies:
+    def __init__(self):
+        self.variables = set()
+        self.functions = set()
+        self.defines = set()
+
+    def __repr__(self):
+        return (f"Dependencies(variables={sorted(self.variables)}, "
+                f"functions={sorted(self.functions)}, defines={sorted(self.defines)})")
+
+
+def collect_dependencies(node, bound=()):
+    """Collect the globals a piece of code reads, calls and defines.
+
+    Names listed in ``bound`` (function parameters) and names bound by let
+    expressions or earlier block-level let statements are local and are not
+    reported. Bodies of nested FunctionDefs are not entered: defining a
+    function only records its name in ``defines``.
+    """
+    deps = Dependencies()
+    _collect(node, frozenset(bound), deps)
+    return deps
+
+
+def _collect(node, bound, deps):
+    node_type = type(node)
+    if node_type is Number:
+        return bound
+    if node_type is Identifier:
+        if node.name not in bound:
+            deps.variables.add(node.name)
+    elif node_type is BinaryOp or node_type is Comparison:
+        _collect(node.left, bound, deps)
+        _collect(node.right, bound, deps)
+    elif node_type is IfExpr:
+        _collect(node.condition, bound, deps)
+        _collect(node.true_branch, bound, deps)
+        _collect(node.false_branch, bound, deps)
+    elif node_type is LetExpression:
+        _collect(node.value, bound, deps)
+        _collect(node.body, bound | {node.name}, deps)
+    elif node_type is LetStatement:
+        _collect(node.value, bound, deps)
+        return bound | {node.name}
+    elif node_type is FunctionCall:
+        deps.functions.add(node.name)
+        for arg in node.arguments:
+            _collect(arg, bound, deps)
+    elif node_type is FunctionDef:
+        deps.defines.add(node.name)
+    elif node_type is Block:
+        for stmt in node.statements:
+            bound = _collect(stmt, bound, deps)
+    else:
+        raise Exception(f'Cannot analyze {type(node).__name__}')
+    return bound
+
+
+def function_dependencies(func_def):
+    return collect_dependencies(func_def.body, func_def.params)
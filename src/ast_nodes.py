@@ -1,8 +1,10 @@
 class ASTNode:
-    pass
+    __slots__ = ()
 
 
 class Number(ASTNode):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
@@ -11,6 +13,8 @@ class Number(ASTNode):
 
 
 class BinaryOp(ASTNode):
+    __slots__ = ('left', 'operator', 'right')
+
     def __init__(self, left, operator, right):
         self.left = left
         self.operator = operator
@@ -21,20 +25,24 @@ class BinaryOp(ASTNode):
 
 
 class Identifier(ASTNode):
+    __slots__ = ('name', 'slot')
 
     def __init__(self, name):
         self.name = name
+        self.slot = None
 
     def __repr__(self):
         return f"Identifier({self.name})"
 
 
 class FunctionDef(ASTNode):
+    __slots__ = ('name', 'params', 'body', 'frame_size')
 
     def __init__(self, name, params, body):
         self.name = name  
         self.params = params 
         self.body = body  
+        self.frame_size = None
 
     def __repr__(self):
         params_str = ', '.join(self.params)
@@ -42,6 +50,7 @@ class FunctionDef(ASTNode):
 
 
 class FunctionCall(ASTNode):
+    __slots__ = ('name', 'arguments')
 
     def __init__(self, name, arguments):
         self.name = name  
@@ -53,6 +62,7 @@ class FunctionCall(ASTNode):
 
 
 class IfExpr(ASTNode):
+    __slots__ = ('condition', 'true_branch', 'false_branch')
 
     def __init__(self, condition, true_branch, false_branch):
         self.condition = condition
@@ -64,6 +74,7 @@ class IfExpr(ASTNode):
 
 
 class Comparison(ASTNode):
+    __slots__ = ('left', 'operator', 'right')
 
     def __init__(self, left, operator, right):
         self.left = left
@@ -75,27 +86,33 @@ class Comparison(ASTNode):
 
 
 class LetStatement(ASTNode):
+    __slots__ = ('name', 'value', 'slot')
 
     def __init__(self, name, value):
         self.name = name  
         self.value = value  
+        self.slot = None
 
     def __repr__(self):
         return f"LetStatement({self.name} = {self.value})"
 
 
 class LetExpression(ASTNode):
+    __slots__ = ('name', 'value', 'body', 'slot')
 
     def __init__(self, name, value, body):
         self.name = name  
         self.value = value  
         self.body = body  
+        self.slot = None
 
     def __repr__(self):
         return f"LetExpression(let {self.name} = {self.value} in {self.body})"
 
 
 class Block(ASTNode):
+    __slots__ = ('statements',)
+
     def __init__(self, statements):
         self.statements = statements  
 
@@ -0,0 +1,148 @@
+import builtins
+import hashlib
+import io
+import os
+import pickle
+import struct
+import tempfile
+from collections import OrderedDict
+
+import ast_nodes
+import token_types
+from lexer import Lexer
+from parser import Parser
+
+# Bump INTERPRETER_VERSION whenever the AST classes, the parser or the
+# optimizer change in a way that makes previously cached programs invalid.
+INTERPRETER_VERSION = "1.0"
+FORMAT_VERSION = 1
+MAGIC = b'NITC'
+HEADER = struct.Struct('>4sH32s')
+EXTENSION = '.nitc'
+
+
+class CacheUnpickler(pickle.Unpickler):
+    """Only rebuilds AST nodes, token types and exceptions from a cache file."""
+
+    ALLOWED = {
+        ast_nodes.__name__: {name for name, value in vars(ast_nodes).items()
+                             if isinstance(value, type) and issubclass(value, ast_nodes.ASTNode)},
+        token_types.__name__: {'TokenType'},
+        'builtins': {name for name, value in vars(builtins).items()
+                     if isinstance(value, type) and issubclass(value, Exception)},
+    }
+
+    def find_class(self, module, name):
+        if name in self.ALLOWED.get(module, ()):
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"{module}.{name} is not allowed in a program cache")
+
+
+class ProgramCache:
+    """Stores parsed programs on disk so unchanged scripts skip lexing and parsing.
+
+    An entry lives next to its source (``script.nit`` -> ``script.nitc``) or,
+    with ``cache_dir``, in that directory. The file starts with a header
+    holding a magic number, the format version and a SHA-256 key over the
+    interpreter version, the optimize flag and the source text, followed by
+    the pickled list of (line, statement) pairs. Entries whose header does
+    not match, or that cannot be read, are ignored and rewritten; writes go
+    through a temporary file and os.replace, so readers never see a
+    partial entry.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, filename):
+        base, ext = os.path.splitext(os.path.abspath(filename))
+        if ext == EXTENSION:
+            base += ext
+        if self.cache_dir is None:
+            return base + EXTENSION
+        digest = hashlib.sha256(base.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{os.path.basename(base)}-{digest}{EXTENSION}")
+
+    @staticmethod
+    def key(source, optimize):
+        digest = hashlib.sha256()
+        digest.update(f"{INTERPRETER_VERSION}\0{int(bool(optimize))}\0".encode('utf-8'))
+        digest.update(source.encode('utf-8'))
+        return digest.digest()
+
+    def load(self, filename, source, optimize=False):
+        """Return the cached statements for ``source``, or None if there is no valid entry."""
+        try:
+            with open(self.path_for(filename), 'rb') as f:
+                data = f.read()
+            magic, version, key = HEADER.unpack_from(data)
+            if (magic != MAGIC or version != FORMAT_VERSION
+                    or key != self.key(source, optimize)):
+                raise ValueError("stale program cache")
+            program = CacheUnpickler(io.BytesIO(data[HEADER.size:])).load()
+        except Exception:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return program
+
+    def store(self, filename, source, program, optimize=False):
+        path = self.path_for(filename)
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            payload = pickle.dumps(program, protocol=pickle.HIGHEST_PROTOCOL)
+            fd, temp_path = tempfile.mkstemp(prefix='.nitc-', dir=directory)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.key(source, optimize)))
+                    f.write(payload)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except (OSError, pickle.PicklingError, RecursionError):
+            return False
+        return True
+
+
+class ParseCache:
+    """LRU cache from source text to the AST that should be run for it.
+
+    With an ``optimizer`` the cached tree is the optimized one, so a repeated
+    submission skips lexing, parsing and optimizing. Source that fails to
+    parse is not cached. Trees are shared between hits; the interpreters
+    only annotate nodes with slots that are recomputed on every run.
+    """
+
+    def __init__(self, maxsize=256, optimizer=None):
+        self.maxsize = maxsize
+        self.optimizer = optimizer
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, text):
+        entries = self.entries
+        if text in entries:
+            entries.move_to_end(text)
+            self.hits += 1
+            return entries[text]
+        self.misses += 1
+        tree = Parser(Lexer(text).tokens()).parse()
+        if self.optimizer is not None:
+            tree = self.optimizer.optimize(tree)
+        if self.maxsize > 0:
+            entries[text] = tree
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+        return tree
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self.entries), 'maxsize': self.maxsize}
@@ -0,0 +1,211 @@
+import operator
+
+from token_types import TokenType
+from interpreter import Environment
+
+
+def divide(left, right):
+    if right == 0:
+        raise Exception("Division by zero")
+    return left // right
+
+
+OPERATORS = {
+    TokenType.PLUS: operator.add,
+    TokenType.MINUS: operator.sub,
+    TokenType.MULTIPLY: operator.mul,
+    TokenType.DIVIDE: divide,
+}
+
+
+class CompiledFunction:
+    def __init__(self, definition, body, nlocals):
+        self.definition = definition
+        self.body = body
+        self.name = definition.name
+        self.nparams = len(definition.params)
+        self.nlocals = nlocals
+
+    def __repr__(self):
+        return f"CompiledFunction({self.name})"
+
+
+class ClosureCompiler:
+    """Turns AST nodes into Python closures taking the current local frame.
+
+    Every closure captures its already-compiled children, so evaluating a
+    node is a single Python call with no visitor dispatch. Local names are
+    resolved to frame slots at compile time; other names are globals.
+    """
+
+    def __init__(self, interpreter):
+        self.variables = interpreter.global_env.variables
+        self.functions = interpreter.functions
+        self.interpreter = interpreter
+        self.scopes = None
+        self.nlocals = 0
+        self.in_function = False
+
+    def compile(self, tree):
+        body, nlocals = self._compile_code([], tree, in_function=False)
+        return body, nlocals
+
+    def compile_function(self, node):
+        body, nlocals = self._compile_code(node.params, node.body, in_function=True)
+        return CompiledFunction(node, body, nlocals)
+
+    def _compile_code(self, params, body, in_function):
+        saved = (self.scopes, self.nlocals, self.in_function)
+        self.scopes = [{param: slot for slot, param in enumerate(params)}]
+        self.nlocals = len(params)
+        self.in_function = in_function
+        try:
+            return self.compile_node(body), self.nlocals
+        finally:
+            self.scopes, self.nlocals, self.in_function = saved
+
+    def new_slot(self):
+        self.nlocals += 1
+        return self.nlocals - 1
+
+    def lookup(self, name):
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return None
+
+    def compile_node(self, node):
+        method_name = f'compile_{type(node).__name__}'
+        method = getattr(self, method_name, None)
+        if method is None:
+            raise Exception(f'No compile_{type(node).__name__} method')
+        return method(node)
+
+    def compile_Number(self, node):
+        value = node.value
+        return lambda frame: value
+
+    def compile_Identifier(self, node):
+        name = node.name
+        slot = self.lookup(name)
+        if slot is not None:
+            return lambda frame: frame[slot]
+        variables = self.variables
+
+        def load_global(frame):
+            try:
+                return variables[name]
+            except KeyError:
+                raise Exception(f"Undefined variable: {name}") from None
+        return load_global
+
+    def compile_BinaryOp(self, node):
+        left = self.compile_node(node.left)
+        right = self.compile_node(node.right)
+        op = OPERATORS[node.operator]
+        return lambda frame: op(left(frame), right(frame))
+
+    def compile_Comparison(self, node):
+        if node.operator != TokenType.EQUALS:
+            raise Exception(f"Unknown comparison operator: {node.operator}")
+        left = self.compile_node(node.left)
+        right = self.compile_node(node.right)
+        return lambda frame: 1 if left(frame) == right(frame) else 0
+
+    def compile_IfExpr(self, node):
+        condition = self.compile_node(node.condition)
+        true_branch = self.compile_node(node.true_branch)
+        false_branch = self.compile_node(node.false_branch)
+        return lambda frame: true_branch(frame) if condition(frame) != 0 else false_branch(frame)
+
+    def compile_LetStatement(self, node):
+        name = node.name
+        value = self.compile_node(node.value)
+        if self.in_function:
+            function_scope = self.scopes[0]
+            if name not in function_scope:
+                function_scope[name] = self.new_slot()
+            slot = function_scope[name]
+
+            def let_local(frame):
+                result = frame[slot] = value(frame)
+                return f"Variable '{name}' = {result}"
+            return let_local
+
+        variables = self.variables
+
+        def let_global(frame):
+            result = variables[name] = value(frame)
+            return f"Variable '{name}' = {result}"
+        return let_global
+
+    def compile_LetExpression(self, node):
+        value = self.compile_node(node.value)
+        slot = self.new_slot()
+        self.scopes.append({node.name: slot})
+        try:
+            body = self.compile_node(node.body)
+        finally:
+            self.scopes.pop()
+
+        def let_expression(frame):
+            frame[slot] = value(frame)
+            return body(frame)
+        return let_expression
+
+    def compile_FunctionDef(self, node):
+        function = self.compile_function(node)
+        define_function = self.interpreter.define_function
+
+        def function_def(frame):
+            define_function(function)
+            return f"Function '{function.name}' defined"
+        return function_def
+
+    def compile_FunctionCall(self, node):
+        name = node.name
+        functions = self.functions
+        arguments = [self.compile_node(arg) for arg in node.arguments]
+        argc = len(arguments)
+
+        def call(frame):
+            function = functions.get(name)
+            if function is None:
+                raise Exception(f"Undefined function: {name}")
+            args = [arg(frame) for arg in arguments]
+            if argc != function.nparams:
+                raise Exception(
+                    f"Function '{name}' expects {function.nparams} "
+                    f"arguments, got {argc}"
+                )
+            if function.nlocals > argc:
+                args.extend([None] * (function.nlocals - argc))
+            return function.body(args)
+        return call
+
+    def compile_Block(self, node):
+        statements = [self.compile_node(stmt) for stmt in node.statements]
+
+        def block(frame):
+            last = None
+            for stmt in statements:
+                last = stmt(frame)
+            return last
+        return block
+
+
+class ClosureInterpreter:
+    """Execution engine that runs programs compiled by the ClosureCompiler."""
+
+    def __init__(self):
+        self.global_env = Environment()
+        self.functions = {}
+        self.compiler = ClosureCompiler(self)
+
+    def define_function(self, function):
+        self.functions[function.name] = function
+        self.global_env.define_function(function.name, function.definition)
+
+    def interpret(self, tree):
+        body, nlocals = self.compiler.compile(tree)
+        return body([None] * nlocals)
@@ -0,0 +1,225 @@
+from token_types import TokenType
+from ast_nodes import (Number, BinaryOp, Identifier, FunctionDef,
+                       FunctionCall, IfExpr, Comparison, LetStatement, LetExpression, Block)
+
+# Opcodes. Each instruction is an (opcode, argument) tuple; opcodes that take
+# no argument carry 0.
+LOAD_CONST = 0
+LOAD_LOCAL = 1
+STORE_LOCAL = 2
+LOAD_GLOBAL = 3
+STORE_GLOBAL = 4
+ADD = 5
+SUB = 6
+MUL = 7
+DIV = 8
+EQ = 9
+JUMP = 10
+JUMP_IF_FALSE = 11
+LOAD_FUNC = 12
+CALL = 13
+TAIL_CALL = 14
+RETURN = 15
+DEFINE_FUNCTION = 16
+LET_RESULT = 17
+POP = 18
+DUP = 19
+
+OPCODE_NAMES = {
+    value: name for name, value in list(globals().items())
+    if name.isupper() and isinstance(value, int)
+}
+
+BINARY_OPCODES = {
+    TokenType.PLUS: ADD,
+    TokenType.MINUS: SUB,
+    TokenType.MULTIPLY: MUL,
+    TokenType.DIVIDE: DIV,
+}
+
+
+class CodeObject:
+    def __init__(self, name, instructions, consts, names, nparams, nlocals):
+        self.name = name
+        self.instructions = instructions
+        self.consts = consts
+        self.names = names
+        self.nparams = nparams
+        self.nlocals = nlocals
+
+    def disassemble(self):
+        lines = []
+        for index, (op, arg) in enumerate(self.instructions):
+            name = OPCODE_NAMES[op]
+            if op == LOAD_CONST or op == DEFINE_FUNCTION:
+                detail = f"{arg} ({self.consts[arg]!r})"
+            elif op in (LOAD_GLOBAL, STORE_GLOBAL, LOAD_FUNC, LET_RESULT):
+                detail = f"{arg} ({self.names[arg]})"
+            else:
+                detail = str(arg)
+            lines.append(f"{index:4d} {name:<16}{detail}")
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return f"CodeObject({self.name}, {len(self.instructions)} instructions)"
+
+
+class Function:
+    def __init__(self, definition, code):
+        self.definition = definition
+        self.code = code
+        self.name = definition.name
+        self.nparams = len(definition.params)
+
+    def __repr__(self):
+        return f"Function({self.name})"
+
+
+class Compiler:
+    """Compiles AST nodes into CodeObjects for the VM.
+
+    Names bound by parameters, let expressions and block-level let statements
+    are resolved to local slots at compile time; every other name is a global
+    looked up when the instruction runs.
+    """
+
+    def __init__(self):
+        self.instructions = None
+        self.consts = None
+        self.names = None
+        self.scopes = None
+        self.nlocals = 0
+        self.in_function = False
+
+    def compile(self, tree):
+        return self._compile_code('<main>', [], tree, in_function=False)
+
+    def compile_function(self, node):
+        return Function(node, self._compile_code(node.name, node.params, node.body, in_function=True))
+
+    def _compile_code(self, name, params, body, in_function):
+        saved = (self.instructions, self.consts, self.names,
+                 self.scopes, self.nlocals, self.in_function)
+        self.instructions = []
+        self.consts = []
+        self.names = []
+        self.scopes = [{param: slot for slot, param in enumerate(params)}]
+        self.nlocals = len(params)
+        self.in_function = in_function
+        try:
+            self.compile_node(body, tail=in_function)
+            self.emit(RETURN)
+            return CodeObject(name, self.instructions, self.consts, self.names,
+                              len(params), self.nlocals)
+        finally:
+            (self.instructions, self.consts, self.names,
+             self.scopes, self.nlocals, self.in_function) = saved
+
+    def emit(self, op, arg=0):
+        self.instructions.append((op, arg))
+        return len(self.instructions) - 1
+
+    def patch(self, index, target):
+        op, _ = self.instructions[index]
+        self.instructions[index] = (op, target)
+
+    def add_const(self, value):
+        self.consts.append(value)
+        return len(self.consts) - 1
+
+    def add_name(self, name):
+        if name in self.names:
+            return self.names.index(name)
+        self.names.append(name)
+        return len(self.names) - 1
+
+    def new_slot(self):
+        self.nlocals += 1
+        return self.nlocals - 1
+
+    def lookup(self, name):
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return None
+
+    def compile_node(self, node, tail=False):
+        method_name = f'compile_{type(node).__name__}'
+        method = getattr(self, method_name, None)
+        if method is None:
+            raise Exception(f'No compile_{type(node).__name__} method')
+        method(node, tail)
+
+    def compile_Number(self, node, tail):
+        self.emit(LOAD_CONST, self.add_const(node.value))
+
+    def compile_Identifier(self, node, tail):
+        slot = self.lookup(node.name)
+        if slot is not None:
+            self.emit(LOAD_LOCAL, slot)
+        else:
+            self.emit(LOAD_GLOBAL, self.add_name(node.name))
+
+    def compile_BinaryOp(self, node, tail):
+        self.compile_node(node.left)
+        self.compile_node(node.right)
+        self.emit(BINARY_OPCODES[node.operator])
+
+    def compile_Comparison(self, node, tail):
+        if node.operator != TokenType.EQUALS:
+            raise Exception(f"Unknown comparison operator: {node.operator}")
+        self.compile_node(node.left)
+        self.compile_node(node.right)
+        self.emit(EQ)
+
+    def compile_IfExpr(self, node, tail):
+        self.compile_node(node.condition)
+        jump_to_else = self.emit(JUMP_IF_FALSE)
+        self.compile_node(node.true_branch, tail)
+        jump_to_end = self.emit(JUMP)
+        self.patch(jump_to_else, len(self.instructions))
+        self.compile_node(node.false_branch, tail)
+        self.patch(jump_to_end, len(self.instructions))
+
+    def compile_LetStatement(self, node, tail):
+        self.compile_node(node.value)
+        self.emit(DUP)
+        if self.in_function:
+            function_scope = self.scopes[0]
+            if node.name not in function_scope:
+                function_scope[node.name] = self.new_slot()
+            self.emit(STORE_LOCAL, function_scope[node.name])
+        else:
+            self.emit(STORE_GLOBAL, self.add_name(node.name))
+        self.emit(LET_RESULT, self.add_name(node.name))
+
+    def compile_LetExpression(self, node, tail):
+        self.compile_node(node.value)
+        slot = self.new_slot()
+        self.emit(STORE_LOCAL, slot)
+        self.scopes.append({node.name: slot})
+        try:
+            self.compile_node(node.body, tail)
+        finally:
+            self.scopes.pop()
+
+    def compile_FunctionDef(self, node, tail):
+        self.emit(DEFINE_FUNCTION, self.add_const(self.compile_function(node)))
+
+    def compile_FunctionCall(self, node, tail):
+        self.emit(LOAD_FUNC, self.add_name(node.name))
+        for arg in node.arguments:
+            self.compile_node(arg)
+        self.emit(TAIL_CALL if tail else CALL, len(node.arguments))
+
+    def compile_Block(self, node, tail):
+        if not node.statements:
+            self.emit(LOAD_CONST, self.add_const(None))
+            return
+        last = len(node.statements) - 1
+        for index, stmt in enumerate(node.statements):
+            if index < last:
+                self.compile_node(stmt)
+                self.emit(POP)
+            else:
+                self.compile_node(stmt, tail)
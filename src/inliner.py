@@ -0,0 +1,193 @@
+from ast_nodes import (Number, BinaryOp, Identifier, FunctionDef,
+                       FunctionCall, IfExpr, Comparison, LetStatement, LetExpression, Block)
+from analysis import function_dependencies
+
+
+class InlineInfo:
+    def __init__(self, func_def):
+        deps = function_dependencies(func_def)
+        self.size = count_nodes(func_def.body)
+        self.recursive = func_def.name in deps.functions
+        self.free_variables = deps.variables
+        self.expression_body = type(func_def.body) is not Block
+
+
+def count_nodes(node):
+    node_type = type(node)
+    if node_type is Number or node_type is Identifier:
+        return 1
+    if node_type is BinaryOp or node_type is Comparison:
+        return 1 + count_nodes(node.left) + count_nodes(node.right)
+    if node_type is IfExpr:
+        return (1 + count_nodes(node.condition) + count_nodes(node.true_branch)
+                + count_nodes(node.false_branch))
+    if node_type is LetExpression:
+        return 1 + count_nodes(node.value) + count_nodes(node.body)
+    if node_type is LetStatement:
+        return 1 + count_nodes(node.value)
+    if node_type is FunctionCall:
+        return 1 + sum(count_nodes(arg) for arg in node.arguments)
+    if node_type is Block:
+        return 1 + sum(count_nodes(stmt) for stmt in node.statements)
+    return 1
+
+
+def rename(node, mapping):
+    """Copy an expression, renaming the free uses of names in ``mapping``."""
+    node_type = type(node)
+    if node_type is Number:
+        return node
+    if node_type is Identifier:
+        return Identifier(mapping.get(node.name, node.name))
+    if node_type is BinaryOp:
+        return BinaryOp(rename(node.left, mapping), node.operator, rename(node.right, mapping))
+    if node_type is Comparison:
+        return Comparison(rename(node.left, mapping), node.operator, rename(node.right, mapping))
+    if node_type is IfExpr:
+        return IfExpr(rename(node.condition, mapping), rename(node.true_branch, mapping),
+                      rename(node.false_branch, mapping))
+    if node_type is LetExpression:
+        value = rename(node.value, mapping)
+        if node.name in mapping:
+            mapping = {name: new for name, new in mapping.items() if name != node.name}
+        return LetExpression(node.name, value, rename(node.body, mapping))
+    if node_type is FunctionCall:
+        return FunctionCall(node.name, [rename(arg, mapping) for arg in node.arguments])
+    raise Exception(f'Cannot inline {type(node).__name__}')
+
+
+class Inliner:
+    """Substitutes the bodies of small non-recursive functions at their call sites.
+
+    ``#double(y + 1)`` with ``func double(x) = x * 2`` becomes
+    ``let x$1 = y + 1 in x$1 * 2``: arguments are still evaluated once and
+    in order, and parameters get fresh names so they cannot capture the
+    caller's variables. A call is left alone when the callee's free globals
+    are shadowed by locals at the call site.
+
+    The Inliner keeps every function's definition as written. define()
+    returns the definitions to install: the new function and every function
+    that had inlined it, re-expanded from their original bodies, so no call
+    site keeps a stale copy of a redefined callee.
+    """
+
+    def __init__(self, max_size=16):
+        self.max_size = max_size
+        self.definitions = {}
+        self.expanded = {}
+        self.info = {}
+        self.inlined_calls = {}
+        self.excluded = frozenset()
+        self.counter = 0
+
+    def define(self, func_def):
+        name = func_def.name
+        self.definitions[name] = func_def
+        stale = {name}
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            for caller, callees in self.inlined_calls.items():
+                if current in callees and caller not in stale:
+                    stale.add(caller)
+                    pending.append(caller)
+
+        installed = []
+        while stale:
+            ready = [candidate for candidate in stale
+                     if not (self.calls(candidate) & (stale - {candidate}))]
+            current = min(ready or stale)
+            stale.discard(current)
+            self.excluded = stale
+            try:
+                installed.append(self.expand_function(self.definitions[current]))
+            finally:
+                self.excluded = frozenset()
+        return installed
+
+    def calls(self, name):
+        return function_dependencies(self.definitions[name]).functions
+
+    def expand_function(self, func_def):
+        name = func_def.name
+        used = set()
+        body = self.expand(func_def.body, frozenset(func_def.params), name, used)
+        if body is not func_def.body:
+            func_def = FunctionDef(name, func_def.params, body)
+        self.expanded[name] = func_def
+        self.info[name] = InlineInfo(func_def)
+        self.inlined_calls[name] = used
+        return func_def
+
+    def inline(self, tree):
+        """Expand calls in a top-level statement."""
+        if type(tree) is FunctionDef:
+            return tree
+        return self.expand(tree, frozenset(), None, set())
+
+    def expand(self, node, bound, caller, used):
+        node_type = type(node)
+        if node_type is Number or node_type is Identifier or node_type is FunctionDef:
+            return node
+        if node_type is BinaryOp or node_type is Comparison:
+            left = self.expand(node.left, bound, caller, used)
+            right = self.expand(node.right, bound, caller, used)
+            if left is node.left and right is node.right:
+                return node
+            return node_type(left, node.operator, right)
+        if node_type is IfExpr:
+            condition = self.expand(node.condition, bound, caller, used)
+            true_branch = self.expand(node.true_branch, bound, caller, used)
+            false_branch = self.expand(node.false_branch, bound, caller, used)
+            if (condition is node.condition and true_branch is node.true_branch
+                    and false_branch is node.false_branch):
+                return node
+            return IfExpr(condition, true_branch, false_branch)
+        if node_type is LetExpression:
+            value = self.expand(node.value, bound, caller, used)
+            body = self.expand(node.body, bound | {node.name}, caller, used)
+            if value is node.value and body is node.body:
+                return node
+            return LetExpression(node.name, value, body)
+        if node_type is LetStatement:
+            value = self.expand(node.value, bound, caller, used)
+            if value is node.value:
+                return node
+            return LetStatement(node.name, value)
+        if node_type is Block:
+            statements = []
+            for stmt in node.statements:
+                statements.append(self.expand(stmt, bound, caller, used))
+                if type(stmt) is LetStatement:
+                    bound = bound | {stmt.name}
+            if all(new is old for new, old in zip(statements, node.statements)):
+                return node
+            return Block(statements)
+        if node_type is FunctionCall:
+            arguments = [self.expand(arg, bound, caller, used) for arg in node.arguments]
+            if self.can_inline(node.name, len(arguments), bound, caller):
+                used.add(node.name)
+                used |= self.inlined_calls[node.name]
+                return self.substitute(self.expanded[node.name], arguments)
+            if all(new is old for new, old in zip(arguments, node.arguments)):
+                return node
+            return FunctionCall(node.name, arguments)
+        raise Exception(f'Cannot inline {type(node).__name__}')
+
+    def can_inline(self, name, argc, bound, caller):
+        if name == caller or name not in self.expanded or name in self.excluded:
+            return False
+        info = self.info[name]
+        return (len(self.expanded[name].params) == argc
+                and info.expression_body
+                and not info.recursive
+                and info.size <= self.max_size
+                and not (info.free_variables & bound))
+
+    def substitute(self, func_def, arguments):
+        self.counter += 1
+        mapping = {param: f"{param}${self.counter}" for param in func_def.params}
+        node = rename(func_def.body, mapping)
+        for param, argument in reversed(list(zip(func_def.params, arguments))):
+            node = LetExpression(mapping[param], argument, node)
+        return node
@@ -1,6 +1,19 @@
 from token_types import TokenType
-from ast_nodes import (Number, BinaryOp, Identifier, FunctionDef,
+from ast_nodes import (ASTNode, Number, BinaryOp, Identifier, FunctionDef,
                        FunctionCall, IfExpr, Comparison, LetStatement, LetExpression, Block)
+from memo import Memoizer, MISSING
+from resolver import Resolver
+from inliner import Inliner
+from profiler import Profiler
+from limits import Limits, LimitExceeded
+from jit import JIT, JIT_THRESHOLD
+from reactive import Reactive
+
+try:
+    import numpy as np
+    from vectorize import Vectorizer
+except ImportError:
+    np = Vectorizer = None
 
 class Environment:
     def __init__(self, parent=None):
@@ -32,15 +45,84 @@ class Environment:
         return f"Env(vars={self.variables}, funcs={list(self.functions.keys())})"
 
 
+class TailCall:
+    """A call found in tail position, returned to the trampoline in visit_FunctionCall."""
+
+    def __init__(self, func_def, arg_values):
+        self.func_def = func_def
+        self.arg_values = arg_values
+
+
+# Node types run_body follows in place when their visitors are not overridden.
+TAIL_NODES = (IfExpr, LetExpression, FunctionCall, Block)
+
+
+def node_classes(base=ASTNode):
+    for cls in base.__subclasses__():
+        yield cls
+        yield from node_classes(cls)
+
+
 class Interpreter:
-    def __init__(self):
+    # Maps node classes to visit_<ClassName> functions. Every subclass gets
+    # its own table, built when the class is created, so overriding a
+    # visitor in a subclass works as before; node classes unknown at that
+    # point are looked up on first use.
+    dispatch = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.dispatch = cls.build_dispatch()
+        cls.tail_inline = cls.find_tail_inline()
+
+    @classmethod
+    def build_dispatch(cls):
+        return {node_class: cls.find_visitor(node_class) for node_class in node_classes()}
+
+    @classmethod
+    def find_tail_inline(cls):
+        if cls.visit is not Interpreter.visit:
+            return frozenset()
+        return frozenset(node_class for node_class in TAIL_NODES
+                         if cls.find_visitor(node_class) is Interpreter.find_visitor(node_class))
+
+    @classmethod
+    def find_visitor(cls, node_class):
+        return getattr(cls, f'visit_{node_class.__name__}', cls.generic_visit)
+
+    def __init__(self, memoize=False, memo_maxsize=1024, inline=False, profile=False,
+                 vectorize=False, max_steps=None, max_depth=None, time_limit=None,
+                 jit=False, jit_threshold=JIT_THRESHOLD, jit_dump=False, reactive=False):
         self.global_env = Environment()
-        self.current_env = self.global_env
+        self.frame = []
+        self.resolver = Resolver()
+        self.memo = Memoizer(memoize, memo_maxsize) if memoize else None
+        self.inliner = Inliner() if inline else None
+        self.reactive = Reactive(self) if reactive else None
+        self.profiler = None
+        self.vectorizer = None
+        if vectorize:
+            if Vectorizer is None:
+                raise Exception("vectorize=True requires NumPy")
+            self.vectorizer = Vectorizer(self)
+        if profile:
+            Profiler().install(self)
+        self.limits = None
+        if (max_steps, max_depth, time_limit) != (None, None, None):
+            Limits(max_steps, max_depth, time_limit).install(self)
+        self.jit = None
+        if jit:
+            # Generated code calls itself directly, past the per-call hooks.
+            if memoize or profile or self.limits is not None:
+                raise Exception("jit=True cannot be combined with memoize, profile or limits")
+            JIT(jit_threshold, jit_dump).install(self, TailCall)
     
     def visit(self, node):
-        method_name = f'visit_{type(node).__name__}'
-        method = getattr(self, method_name, self.generic_visit)
-        return method(node)
+        try:
+            method = self.dispatch[type(node)]
+        except KeyError:
+            method = self.dispatch[type(node)] = self.find_visitor(type(node))
+        return method(self, node)
     
     def generic_visit(self, node):
         raise Exception(f'No visit_{type(node).__name__} method')
@@ -49,7 +131,12 @@ class Interpreter:
         return node.value
     
     def visit_Identifier(self, node):
-        return self.current_env.get_variable(node.name)
+        if node.slot is not None:
+            return self.frame[node.slot]
+        try:
+            return self.global_env.variables[node.name]
+        except KeyError:
+            raise Exception(f"Undefined variable: {node.name}") from None
     
     def visit_BinaryOp(self, node):
         left_val = self.visit(node.left)
@@ -84,26 +171,38 @@ class Interpreter:
     
     def visit_LetStatement(self, node):
         value = self.visit(node.value)
-        self.current_env.define_variable(node.name, value)
+        if node.slot is not None:
+            self.frame[node.slot] = value
+        else:
+            self.global_env.define_variable(node.name, value)
+            if self.memo is not None:
+                self.memo.define_variable(node.name)
+            if self.reactive is not None:
+                return '\n'.join([f"Variable '{node.name}' = {value}"]
+                                 + self.reactive.define_variable(node))
         return f"Variable '{node.name}' = {value}"
     
     def visit_LetExpression(self, node):
-        value = self.visit(node.value)
-        new_env = Environment(parent=self.current_env)
-        new_env.define_variable(node.name, value)
-        previous_env = self.current_env
-        self.current_env = new_env
-        try:
-            result = self.visit(node.body)
-            return result
-        finally:
-            self.current_env = previous_env
+        self.frame[node.slot] = self.visit(node.value)
+        return self.visit(node.body)
     
     def visit_FunctionDef(self, node):
-        self.global_env.define_function(node.name, node)
+        definitions = self.inliner.define(node) if self.inliner is not None else [node]
+        for func_def in definitions:
+            if func_def.frame_size is None:
+                self.resolver.resolve_function(func_def)
+            self.global_env.define_function(func_def.name, func_def)
+            if self.jit is not None:
+                self.jit.forget(func_def.name)
+            if self.memo is not None:
+                self.memo.define_function(func_def)
+        if self.reactive is not None:
+            return '\n'.join([f"Function '{node.name}' defined"]
+                             + self.reactive.define_function(
+                                 [func_def.name for func_def in definitions]))
         return f"Function '{node.name}' defined"
     
-    def visit_FunctionCall(self, node):
+    def prepare_call(self, node):
         func_def = self.global_env.get_function(node.name)
         arg_values = [self.visit(arg) for arg in node.arguments]
         if len(arg_values) != len(func_def.params):
@@ -111,16 +210,114 @@ class Interpreter:
                 f"Function '{node.name}' expects {len(func_def.params)} "
                 f"arguments, got {len(arg_values)}"
             )
-        func_env = Environment(parent=self.global_env)
-        for param_name, arg_value in zip(func_def.params, arg_values):
-            func_env.define_variable(param_name, arg_value)
-        previous_env = self.current_env
-        self.current_env = func_env
+        return func_def, arg_values
+
+    def visit_FunctionCall(self, node):
+        func_def, arg_values = self.prepare_call(node)
+        return self.call_function(func_def, arg_values)
+
+    def call_function(self, func_def, arg_values):
+        """Run ``func_def`` on already evaluated arguments; ``arg_values`` becomes its frame."""
+        memo = self.memo
+        pending = []
+        previous_frame = self.frame
         try:
-            result = self.visit(func_def.body)
-            return result
+            while True:
+                if memo is not None:
+                    cache = memo.cache_for(func_def.name)
+                    if cache is not None:
+                        key = tuple(arg_values)
+                        result = cache.get(key)
+                        if result is not MISSING:
+                            break
+                        pending.append((cache, key))
+                if func_def.frame_size > len(arg_values):
+                    arg_values.extend([None] * (func_def.frame_size - len(arg_values)))
+                self.frame = arg_values
+                result = self.run_body(func_def)
+                if type(result) is not TailCall:
+                    break
+                func_def, arg_values = result.func_def, result.arg_values
         finally:
-            self.current_env = previous_env
+            self.frame = previous_frame
+        for cache, key in pending:
+            cache.put(key, result)
+        return result
+
+    def call_batch(self, name, columns):
+        """Call function ``name`` once per row of ``columns``, one column per parameter.
+
+        Columns may be lists or NumPy arrays of equal length. The function is
+        looked up and checked once, and each row is run directly on its
+        argument values, without building or dispatching a FunctionCall node.
+        Returns a list, or a NumPy array when any column is one. With
+        ``vectorize=True``, functions the Vectorizer accepts run as whole-array
+        NumPy operations instead. Step and time limits apply to the batch as
+        a whole.
+        """
+        func_def = self.global_env.get_function(name)
+        if len(columns) != len(func_def.params):
+            raise Exception(
+                f"Function '{name}' expects {len(func_def.params)} "
+                f"arguments, got {len(columns)}"
+            )
+        lengths = {len(column) for column in columns}
+        if len(lengths) > 1:
+            raise Exception(f"Columns for '{name}' have different lengths: {sorted(lengths)}")
+        as_array = np is not None and any(isinstance(column, np.ndarray) for column in columns)
+        if self.limits is not None:
+            self.limits.start()
+        if self.vectorizer is not None and self.profiler is None:
+            results = self.vectorizer.call_batch(name, columns)
+            if results is not None:
+                return results if as_array else results.tolist()
+        # NumPy scalars would overflow where NITLang integers do not.
+        columns = [column.tolist() if np is not None and isinstance(column, np.ndarray)
+                   else list(column) for column in columns]
+        call = self.call_function
+        if columns:
+            results = [call(func_def, list(row)) for row in zip(*columns)]
+        else:
+            results = []
+        if as_array:
+            fits = all(type(result) is int and -2**63 <= result < 2**63 for result in results)
+            results = np.array(results, dtype=np.int64 if fits else object)
+        return results
+
+    def run_body(self, func_def):
+        """Evaluate a function body, returning a TailCall for calls in tail position.
+
+        The branches of an IfExpr, the body of a LetExpression and the last
+        statement of a Block are followed in a loop instead of recursing, so
+        the caller can reuse its Python frame for the next call. Node types
+        whose visitor a subclass overrides are dispatched as usual instead.
+
+        The trampoline calls this once per activation, so wrapping it on an
+        instance (as the profiler does) observes every call, including tail
+        calls, without changing the trampoline itself.
+        """
+        node = func_def.body
+        inline = self.tail_inline
+        while True:
+            node_type = type(node)
+            if node_type not in inline:
+                return self.visit(node)
+            if node_type is IfExpr:
+                if self.visit(node.condition) != 0:
+                    node = node.true_branch
+                else:
+                    node = node.false_branch
+            elif node_type is LetExpression:
+                self.frame[node.slot] = self.visit(node.value)
+                node = node.body
+            elif node_type is FunctionCall:
+                return TailCall(*self.prepare_call(node))
+            elif node_type is Block and node.statements:
+                for stmt in node.statements[:-1]:
+                    self.visit(stmt)
+                node = node.statements[-1]
+            else:
+                return self.visit(node)
 
     def visit_Block(self, node):
         last = None
@@ -129,4 +326,18 @@ class Interpreter:
         return last
 
     def interpret(self, tree):
-        return self.visit(tree)
+        if self.inliner is not None:
+            tree = self.inliner.inline(tree)
+        frame_size = self.resolver.resolve(tree)
+        if self.limits is not None:
+            self.limits.start()
+        previous_frame = self.frame
+        self.frame = [None] * frame_size
+        try:
+            return self.visit(tree)
+        finally:
+            self.frame = previous_frame
+
+
+Interpreter.dispatch = Interpreter.build_dispatch()
+Interpreter.tail_inline = Interpreter.find_tail_inline()
@@ -0,0 +1,262 @@
+import sys
+
+from token_types import TokenType
+from ast_nodes import (Number, BinaryOp, Identifier, FunctionCall, IfExpr,
+                       Comparison, LetStatement, LetExpression, Block)
+from analysis import function_dependencies
+
+JIT_THRESHOLD = 100
+
+ARITHMETIC = {
+    TokenType.PLUS: '+',
+    TokenType.MINUS: '-',
+    TokenType.MULTIPLY: '*',
+}
+
+
+# closure_compiler.divide, which cannot be imported here: that module
+# imports the interpreter, which imports this one.
+def divide(left, right):
+    if right == 0:
+        raise Exception("Division by zero")
+    return left // right
+
+
+class Unsupported(Exception):
+    """Raised while translating a function the JIT leaves to the interpreter."""
+
+
+class Transpiler:
+    """Writes the Python source of one resolved FunctionDef.
+
+    Frame slots become locals ``s0``, ``s1``, ... (parameters first), so
+    let bindings are plain assignments, or ``:=`` inside an expression.
+    Bodies are emitted as statements while in tail position: an IfExpr
+    becomes if/else and a self call in tail position reassigns the
+    parameters and continues a ``while True`` loop. Other self calls are
+    direct Python calls unless the function tail-calls another one, as
+    those return a TailCall to the interpreter's trampoline. Globals and
+    other functions are looked up when the code runs, so it sees later
+    redefinitions.
+    """
+
+    def __init__(self, func_def):
+        self.func_def = func_def
+        self.name = f"nit_{func_def.name}"
+        self.lines = []
+        self.loops = False
+        self.direct_calls = not self.has_other_tail_call(func_def.body)
+
+    def source(self):
+        self.tail(self.func_def.body, 1)
+        body = self.lines
+        if self.loops:
+            body = ["    while True:"] + ["    " + line for line in body]
+        params = ', '.join(f"s{slot}" for slot in range(len(self.func_def.params)))
+        return '\n'.join([f"def {self.name}({params}):"] + body) + '\n'
+
+    def has_other_tail_call(self, node):
+        node_type = type(node)
+        if node_type is IfExpr:
+            return self.has_other_tail_call(node.true_branch) or self.has_other_tail_call(node.false_branch)
+        if node_type is LetExpression:
+            return self.has_other_tail_call(node.body)
+        if node_type is Block:
+            return bool(node.statements) and self.has_other_tail_call(node.statements[-1])
+        return node_type is FunctionCall and not self.is_self_call(node)
+
+    def is_self_call(self, node):
+        return node.name == self.func_def.name and len(node.arguments) == len(self.func_def.params)
+
+    def emit(self, depth, line):
+        self.lines.append("    " * depth + line)
+
+    def tail(self, node, depth):
+        node_type = type(node)
+        if node_type is IfExpr:
+            self.emit(depth, f"if {self.expr(node.condition)} != 0:")
+            self.tail(node.true_branch, depth + 1)
+            self.emit(depth, "else:")
+            self.tail(node.false_branch, depth + 1)
+        elif node_type is LetExpression:
+            self.emit(depth, f"s{node.slot} = {self.expr(node.value)}")
+            self.tail(node.body, depth)
+        elif node_type is Block:
+            if not node.statements:
+                self.emit(depth, "return None")
+                return
+            for stmt in node.statements[:-1]:
+                if type(stmt) is LetStatement:
+                    self.emit(depth, f"s{stmt.slot} = {self.expr(stmt.value)}")
+                else:
+                    self.emit(depth, self.expr(stmt))
+            last = node.statements[-1]
+            if type(last) is LetStatement:
+                self.emit(depth, f"s{last.slot} = {self.expr(last.value)}")
+                self.emit(depth, f"return f\"Variable '{last.name}' = {{s{last.slot}}}\"")
+            else:
+                self.tail(last, depth)
+        elif node_type is FunctionCall and self.is_self_call(node):
+            arguments = ', '.join(self.expr(arg) for arg in node.arguments)
+            params = ', '.join(f"s{slot}" for slot in range(len(node.arguments)))
+            if params:
+                self.emit(depth, f"{params} = {arguments}")
+            self.emit(depth, "continue")
+            self.loops = True
+        elif node_type is FunctionCall:
+            self.emit(depth, f"return _tail({self.call_arguments(node)})")
+        else:
+            self.emit(depth, f"return {self.expr(node)}")
+
+    def call_arguments(self, node):
+        return ', '.join([f"_function({node.name!r})"] + [self.expr(arg) for arg in node.arguments])
+
+    def expr(self, node):
+        node_type = type(node)
+        if node_type is Number:
+            return repr(node.value)
+        if node_type is Identifier:
+            if node.slot is not None:
+                return f"s{node.slot}"
+            return f"(_globals[{node.name!r}] if {node.name!r} in _globals else _undefined({node.name!r}))"
+        if node_type is BinaryOp:
+            left, right = self.expr(node.left), self.expr(node.right)
+            if node.operator == TokenType.DIVIDE:
+                return f"_div({left}, {right})"
+            if node.operator not in ARITHMETIC:
+                raise Unsupported(f"operator {node.operator}")
+            return f"({left} {ARITHMETIC[node.operator]} {right})"
+        if node_type is Comparison:
+            if node.operator != TokenType.EQUALS:
+                raise Unsupported(f"Unknown comparison operator: {node.operator}")
+            return f"(1 if {self.expr(node.left)} == {self.expr(node.right)} else 0)"
+        if node_type is IfExpr:
+            return (f"({self.expr(node.true_branch)} if {self.expr(node.condition)} != 0 "
+                    f"else {self.expr(node.false_branch)})")
+        if node_type is LetExpression:
+            return f"((s{node.slot} := {self.expr(node.value)}), {self.expr(node.body)})[1]"
+        if node_type is FunctionCall:
+            if self.direct_calls and self.is_self_call(node):
+                return f"{self.name}({', '.join(self.expr(arg) for arg in node.arguments)})"
+            return f"_call({self.call_arguments(node)})"
+        raise Unsupported(f"{node_type.__name__} in an expression")
+
+
+class JIT:
+    """Counts calls per user function and runs hot ones as generated Python code.
+
+    install() wraps run_body on one Interpreter instance, as the profiler
+    does. After ``threshold`` activations of a FunctionDef, the Transpiler
+    writes it as Python source, which is compiled with compile() and used
+    for every later activation of that definition. Redefining the function
+    drops its code, and functions that (through their callees) define
+    functions, or that Python cannot compile, stay interpreted. With
+    ``dump`` the generated source is written to ``stream``.
+    """
+
+    def __init__(self, threshold=JIT_THRESHOLD, dump=False, stream=None):
+        self.threshold = threshold
+        self.dump = dump
+        self.stream = stream
+        self.counts = {}
+        self.compiled = {}
+        self.sources = {}
+
+    def install(self, interpreter, tail_call):
+        self.interpreter = interpreter
+        self.tail_call = tail_call
+        run_body = interpreter.run_body
+        compiled = self.compiled
+        counts = self.counts
+        threshold = self.threshold
+
+        def jit_run_body(func_def):
+            entry = compiled.get(func_def.name)
+            if entry is not None and entry[0] is func_def:
+                if entry[1] is not None:
+                    return entry[1](*interpreter.frame[:len(func_def.params)])
+                return run_body(func_def)
+            count = counts.get(func_def, 0) + 1
+            if count < threshold:
+                counts[func_def] = count
+                return run_body(func_def)
+            counts.pop(func_def, None)
+            native = self.compile(func_def)
+            compiled[func_def.name] = (func_def, native)
+            if native is None:
+                return run_body(func_def)
+            return native(*interpreter.frame[:len(func_def.params)])
+
+        interpreter.run_body = jit_run_body
+        interpreter.jit = self
+        return self
+
+    def forget(self, name):
+        """Drop the generated code and call count of function ``name``."""
+        self.compiled.pop(name, None)
+        self.sources.pop(name, None)
+        for func_def in [func_def for func_def in self.counts if func_def.name == name]:
+            del self.counts[func_def]
+
+    def defines_functions(self, func_def):
+        functions = self.interpreter.global_env.functions
+        seen = set()
+        pending = [func_def]
+        while pending:
+            deps = function_dependencies(pending.pop())
+            if deps.defines:
+                return True
+            for name in deps.functions - seen:
+                seen.add(name)
+                if name in functions:
+                    pending.append(functions[name])
+        return False
+
+    def compile(self, func_def):
+        """Return a Python function running ``func_def``, or None to keep interpreting it."""
+        if self.defines_functions(func_def):
+            return None
+        try:
+            transpiler = Transpiler(func_def)
+            source = transpiler.source()
+            code = compile(source, f"<jit {func_def.name}>", 'exec')
+        except (Unsupported, SyntaxError, RecursionError, MemoryError):
+            return None
+        namespace = self.namespace()
+        exec(code, namespace)
+        self.sources[func_def.name] = source
+        if self.dump:
+            print(f"# jit: {func_def.name}\n{source}", file=self.stream or sys.stderr)
+        return namespace[transpiler.name]
+
+    def namespace(self):
+        interpreter = self.interpreter
+        functions = interpreter.global_env.functions
+        tail_call = self.tail_call
+
+        def undefined(name):
+            raise Exception(f"Undefined variable: {name}")
+
+        def function(name):
+            func_def = functions.get(name)
+            if func_def is None:
+                raise Exception(f"Undefined function: {name}")
+            return func_def
+
+        def check(func_def, arguments):
+            if len(arguments) != len(func_def.params):
+                raise Exception(
+                    f"Function '{func_def.name}' expects {len(func_def.params)} "
+                    f"arguments, got {len(arguments)}"
+                )
+
+        def call(func_def, *arguments):
+            check(func_def, arguments)
+            return interpreter.call_function(func_def, list(arguments))
+
+        def tail(func_def, *arguments):
+            check(func_def, arguments)
+            return tail_call(func_def, list(arguments))
+
+        return {'_globals': interpreter.global_env.variables, '_undefined': undefined,
+                '_function': function, '_call': call, '_tail': tail, '_div': divide}
@@ -1,121 +1,123 @@
+import re
+
 from token_types import Token, TokenType, KEYWORDS
 
+TOKEN_PATTERN = re.compile(r'''
+    (?P<WHITESPACE>[ \t\n\r]+)
+  | (?P<NUMBER>\d+)
+  | (?P<NAME>[^\W\d]\w*)
+  | (?P<COMMENT>\#(?![^\W\d])[^\n]*)
+  | (?P<SYMBOL>==|[-+*/=(){},\#])
+  | (?P<INVALID>.)
+''', re.VERBOSE | re.DOTALL)
+
+SYMBOLS = {
+    '+': TokenType.PLUS,
+    '-': TokenType.MINUS,
+    '*': TokenType.MULTIPLY,
+    '/': TokenType.DIVIDE,
+    '==': TokenType.EQUALS,
+    '=': TokenType.ASSIGN,
+    '(': TokenType.LPAREN,
+    ')': TokenType.RPAREN,
+    '{': TokenType.LBRACE,
+    '}': TokenType.RBRACE,
+    ',': TokenType.COMMA,
+    '#': TokenType.HASH,
+}
+
+
 class Lexer:
     def __init__(self, text):
         self.text = text
         self.pos = 0
+        self.line = 1
         self.current_char = self.text[0] if text else None
-    
+
     def error(self):
         raise Exception(f'Invalid character "{self.current_char}" at position {self.pos}')
-    
-    def advance(self):
-        self.pos += 1
-        if self.pos >= len(self.text):
-            self.current_char = None
-        else:
-            self.current_char = self.text[self.pos]
-    
-    def peek(self):
-        peek_pos = self.pos + 1
-        if peek_pos >= len(self.text):
-            return None
-        return self.text[peek_pos]
-    
-    def skip_whitespace(self):
-        while self.current_char and self.current_char in ' \t\n\r':
-            self.advance()
-    
-    def skip_comment(self):
-        if self.peek() and (self.peek().isalpha() or self.peek() == '_'):
-            return False
-        while self.current_char and self.current_char != '\n':
-            self.advance()
-        self.skip_whitespace()
-        return True
-    
-    def number(self):
-        result = ''
-        start_pos = self.pos
-        while self.current_char and self.current_char.isdigit():
-            result += self.current_char
-            self.advance()
-        return Token(TokenType.NUMBER, int(result), start_pos)
-    
-    def identifier(self):
-        result = ''
-        start_pos = self.pos
-        while self.current_char and (self.current_char.isalnum() or self.current_char == '_'):
-            result += self.current_char
-            self.advance()
-        token_type = KEYWORDS.get(result, TokenType.IDENTIFIER)
-        return Token(token_type, result, start_pos)
-    
+
     def get_next_token(self):
-        while self.current_char:
-            if self.current_char in ' \t\n\r':
-                self.skip_whitespace()
+        text = self.text
+        while self.pos < len(text):
+            match = TOKEN_PATTERN.match(text, self.pos)
+            kind = match.lastgroup
+            start = self.pos
+            self.pos = match.end()
+            if kind == 'WHITESPACE':
+                self.line += match.group().count('\n')
+                continue
+            if kind == 'COMMENT':
                 continue
-            if self.current_char.isdigit():
-                return self.number()
-            if self.current_char.isalpha() or self.current_char == '_':
-                return self.identifier()
-            if self.current_char == '+':
-                pos = self.pos
-                self.advance()
-                return Token(TokenType.PLUS, '+', pos)
-            if self.current_char == '-':
-                pos = self.pos
-                self.advance()
-                return Token(TokenType.MINUS, '-', pos)
-            if self.current_char == '*':
-                pos = self.pos
-                self.advance()
-                return Token(TokenType.MULTIPLY, '*', pos)
-            if self.current_char == '/':
-                pos = self.pos
-                self.advance()
-                return Token(TokenType.DIVIDE, '/', pos)
-            if self.current_char == '=':
-                pos = self.pos
-                self.advance()
-                if self.current_char == '=':
-                    self.advance()
-                    return Token(TokenType.EQUALS, '==', pos)
-                else:
-                    return Token(TokenType.ASSIGN, '=', pos)
-            if self.current_char == '(':
-                pos = self.pos
-                self.advance()
-                return Token(TokenType.LPAREN, '(', pos)
-            if self.current_char == ')':
-                pos = self.pos
-                self.advance()
-                return Token(TokenType.RPAREN, ')', pos)
-            if self.current_char == '{':
-                pos = self.pos
-                self.advance()
-                return Token(TokenType.LBRACE, '{', pos)
-            if self.current_char == '}':
-                pos = self.pos
-                self.advance()
-                return Token(TokenType.RBRACE, '}', pos)
-            if self.current_char == ',':
-                pos = self.pos
-                self.advance()
-                return Token(TokenType.COMMA, ',', pos)
-            if self.current_char == '#':
-                pos = self.pos
-                self.advance()
-                return Token(TokenType.HASH, '#', pos)
-            self.error()
-        return Token(TokenType.EOF, None, self.pos)
-    
+            if kind == 'INVALID':
+                self.pos = start
+                self.current_char = text[start]
+                self.error()
+            self.current_char = text[self.pos] if self.pos < len(text) else None
+            return self.make_token(kind, match.group(), start, self.line)
+        self.current_char = None
+        return Token(TokenType.EOF, None, self.pos, self.line)
+
+    @staticmethod
+    def make_token(kind, lexeme, start, line):
+        if kind == 'NUMBER':
+            return Token(TokenType.NUMBER, int(lexeme), start, line)
+        if kind == 'NAME':
+            return Token(KEYWORDS.get(lexeme, TokenType.IDENTIFIER), lexeme, start, line)
+        return Token(SYMBOLS[lexeme], lexeme, start, line)
+
+    def tokens(self):
+        """Yield tokens lazily, ending with EOF, so the parser can consume them as they are produced."""
+        text = self.text
+        keywords = KEYWORDS
+        symbols = SYMBOLS
+        number = TokenType.NUMBER
+        identifier = TokenType.IDENTIFIER
+        line = self.line
+        self.current_char = None
+        for match in TOKEN_PATTERN.finditer(text, self.pos):
+            kind = match.lastgroup
+            if kind == 'WHITESPACE':
+                lexeme = match.group()
+                if '\n' in lexeme:
+                    line += lexeme.count('\n')
+                continue
+            start = match.start()
+            self.pos = match.end()
+            self.line = line
+            if kind == 'NAME':
+                lexeme = match.group()
+                yield Token(keywords.get(lexeme, identifier), lexeme, start, line)
+            elif kind == 'NUMBER':
+                yield Token(number, int(match.group()), start, line)
+            elif kind == 'SYMBOL':
+                lexeme = match.group()
+                yield Token(symbols[lexeme], lexeme, start, line)
+            elif kind == 'INVALID':
+                self.pos = start
+                self.line = line
+                self.current_char = text[start]
+                self.error()
+        self.pos = len(text)
+        self.line = line
+        self.current_char = None
+        yield Token(TokenType.EOF, None, self.pos, line)
+
+    def seek_line(self, position, line):
+        """Move back to the start of ``line``, the line holding ``position``."""
+        self.pos = self.text.rfind('\n', 0, position) + 1
+        self.line = line
+
+    def skip_line(self):
+        """Move past the end of the current line, e.g. to resume after an error."""
+        newline = self.text.find('\n', self.pos)
+        if newline < 0:
+            self.pos = len(self.text)
+        else:
+            self.pos = newline + 1
+            self.line += 1
+
+    __iter__ = tokens
+
     def tokenize(self):
-        tokens = []
-        token = self.get_next_token()
-        while token.type != TokenType.EOF:
-            tokens.append(token)
-            token = self.get_next_token()
-        tokens.append(token)
-        return tokens
+        return list(self.tokens())
@@ -0,0 +1,74 @@
+import time
+
+
+class LimitExceeded(Exception):
+    """Raised when an evaluation runs past its step, call depth or time limit."""
+
+
+class Limits:
+    """Bounds the work one Interpreter.interpret() call may do.
+
+    A step is one function activation, tail calls included: without loops,
+    every unbounded computation in NITLang goes through calls, and the work
+    inside one activation is bounded by the size of its body. ``max_steps``
+    caps the activations per interpret() call, ``max_depth`` the number of
+    nested activations and ``time_limit`` the seconds from the start of
+    interpret(). Any of them may be None.
+
+    install() wraps run_body on one Interpreter instance, like the profiler,
+    so interpreters without limits run the unmodified method. The step
+    count is compared against a precomputed threshold on every call; the
+    clock is only read every ``check_every`` steps.
+    """
+
+    def __init__(self, max_steps=None, max_depth=None, time_limit=None, check_every=1000,
+                 clock=time.monotonic):
+        self.max_steps = max_steps
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.check_every = check_every
+        self.clock = clock
+        self.steps = 0
+        self.depth = 0
+        self.next_check = 0
+        self.deadline = None
+
+    def install(self, interpreter):
+        run_body = interpreter.run_body
+        max_depth = self.max_depth
+
+        def limited_run_body(func_def):
+            self.steps += 1
+            if self.steps >= self.next_check:
+                self.check()
+            if max_depth is not None and self.depth >= max_depth:
+                raise LimitExceeded(f"Call depth limit of {max_depth} exceeded in '{func_def.name}'")
+            self.depth += 1
+            try:
+                return run_body(func_def)
+            finally:
+                self.depth -= 1
+
+        interpreter.run_body = limited_run_body
+        interpreter.limits = self
+        return self
+
+    def start(self):
+        """Reset the counters and the deadline for a new top-level evaluation."""
+        self.steps = 0
+        self.depth = 0
+        self.deadline = None if self.time_limit is None else self.clock() + self.time_limit
+        self.schedule()
+
+    def schedule(self):
+        next_check = self.steps + self.check_every
+        if self.max_steps is not None:
+            next_check = min(next_check, self.max_steps + 1)
+        self.next_check = next_check
+
+    def check(self):
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise LimitExceeded(f"Step limit of {self.max_steps} exceeded")
+        if self.deadline is not None and self.clock() > self.deadline:
+            raise LimitExceeded(f"Time limit of {self.time_limit}s exceeded")
+        self.schedule()
@@ -1,20 +1,41 @@
 from lexer import Lexer
 from parser import Parser
 from interpreter import Interpreter
-
-
-def main():
+from vm import VM
+from closure_compiler import ClosureInterpreter
+from stack_interpreter import StackInterpreter
+from optimizer import Optimizer
+from cache import ProgramCache, ParseCache
+from parallel import ParallelRunner
+
+ENGINES = {
+    'tree': Interpreter,
+    'vm': VM,
+    'closure': ClosureInterpreter,
+    'stack': StackInterpreter,
+}
+
+
+def main(engine='tree', optimize=False, parse_cache_size=256, jit=False, jit_dump=False,
+         reactive=False):
     print("=" * 50)
     print("NITLang Interpreter - Phase 1 Complete")
     print("Steps 1-3: Arithmetic + Functions + Scope")
     print("=" * 50)
     print("Commands:")
     print("  exit    - Exit the interpreter")
-    print("  debug   - Toggle debug mode")
+    print("  debug   - Toggle debug mode and show parse cache statistics")
     print("=" * 50)
     print()
 
-    interpreter = Interpreter()
+    options = {}
+    if jit:
+        options.update(jit=True, jit_dump=jit_dump)
+    if reactive:
+        options['reactive'] = True
+    interpreter = ENGINES[engine](**options)
+    optimizer = Optimizer() if optimize else None
+    parse_cache = ParseCache(parse_cache_size, optimizer)
     debug_mode = False
 
     while True:
@@ -28,20 +49,24 @@ def main():
             if text.lower() == 'debug':
                 debug_mode = not debug_mode
                 print(f"Debug mode: {'ON' if debug_mode else 'OFF'}")
+                stats = parse_cache.stats()
+                print(f"Parse cache: {stats['hits']} hits, {stats['misses']} misses, "
+                      f"{stats['size']}/{stats['maxsize']} entries")
                 continue
 
             if not text.strip():
                 continue
 
-            lexer = Lexer(text)
-            tokens = lexer.tokenize()
             if debug_mode:
+                tokens = Lexer(text).tokenize()
                 print(f"Tokens: {tokens}")
-
-            parser = Parser(tokens)
-            tree = parser.parse()
-            if debug_mode:
+                tree = Parser(tokens).parse()
                 print(f"AST: {tree}")
+                if optimizer is not None:
+                    tree = optimizer.optimize(tree)
+                    print(f"Optimized AST: {tree}")
+            else:
+                tree = parse_cache.parse(text)
 
             result = interpreter.interpret(tree)
             print(f"=> {result}\n")
@@ -52,27 +77,72 @@ def main():
             print(f"Error: {e}\n")
 
 
-def run_file(filename):
+def compile_statements(content, optimizer=None):
+    """Parse (and optionally optimize) a script, yielding (line, statement or error)."""
+    for line_num, statement in Parser.from_source(content).statements(recover=True):
+        if optimizer is not None and not isinstance(statement, Exception):
+            try:
+                statement = optimizer.optimize(statement)
+            except Exception as e:
+                statement = e
+        yield line_num, statement
+
+
+def run_file(filename, engine='tree', optimize=False, cache=None, profile=False,
+             profile_output=None, jobs=None, jit=False, jit_dump=False):
     try:
         with open(filename, 'r', encoding='utf-8') as f:
             content = f.read()
 
-        interpreter = Interpreter()
-
-        for line_num, line in enumerate(content.split('\n'), 1):
-            line = line.strip()
-            if not line or line.startswith('#'):
+        if profile and engine != 'tree':
+            raise Exception(f"Profiling is only supported by the tree engine, not '{engine}'")
+        if profile and jobs:
+            raise Exception("Profiling cannot be combined with parallel execution")
+        if jit and (engine != 'tree' or profile or jobs):
+            raise Exception("The JIT needs the tree engine and cannot be combined with profiling "
+                            "or parallel execution")
+        if profile:
+            interpreter = ENGINES[engine](profile=True)
+        elif jit:
+            interpreter = ENGINES[engine](jit=True, jit_dump=jit_dump)
+        else:
+            interpreter = ENGINES[engine]()
+        optimizer = Optimizer() if optimize else None
+        lines = content.split('\n')
+
+        statements = compile_statements(content, optimizer)
+        if cache is not None:
+            program = cache.load(filename, content, optimize)
+            if program is None:
+                program = list(statements)
+                cache.store(filename, content, program, optimize)
+            statements = program
+
+        if jobs:
+            for line_num, ok, result in ParallelRunner(ENGINES[engine], jobs).run(statements):
+                if ok:
+                    print(f"Line {line_num}: {result}")
+                else:
+                    print(f"Error in line {line_num} '{lines[line_num - 1].strip()}': {result}")
+            return
+
+        for line_num, statement in statements:
+            line = lines[line_num - 1].strip()
+            if isinstance(statement, Exception):
+                print(f"Error in line {line_num} '{line}': {statement}")
                 continue
             try:
-                lexer = Lexer(line)
-                tokens = lexer.tokenize()
-                parser = Parser(tokens)
-                tree = parser.parse()
-                result = interpreter.interpret(tree)
+                result = interpreter.interpret(statement)
                 print(f"Line {line_num}: {result}")
             except Exception as e:
                 print(f"Error in line {line_num} '{line}': {e}")
 
+        if profile:
+            print()
+            print(interpreter.profiler.format_table())
+            if profile_output:
+                interpreter.profiler.dump(profile_output, filename)
+
     except FileNotFoundError:
         print(f"File not found: {filename}")
     except Exception as e:
@@ -80,8 +150,48 @@ def run_file(filename):
 
 
 if __name__ == '__main__':
-    import sys
-    if len(sys.argv) > 1:
-        run_file(sys.argv[1])
+    import argparse
+    arg_parser = argparse.ArgumentParser(description="NITLang Interpreter")
+    arg_parser.add_argument('file', nargs='?', help="script to run; starts the REPL when omitted")
+    arg_parser.add_argument('--engine', choices=sorted(ENGINES), default='tree',
+                            help="execution engine (default: tree)")
+    arg_parser.add_argument('--optimize', action='store_true',
+                            help="constant-fold and simplify each statement before running it")
+    arg_parser.add_argument('--cache', action='store_true',
+                            help="reuse the parsed program from a .nitc file when the script is unchanged")
+    arg_parser.add_argument('--cache-dir', metavar='DIR',
+                            help="keep .nitc files in DIR instead of next to the script (implies --cache)")
+    arg_parser.add_argument('--parse-cache-size', type=int, default=256, metavar='N',
+                            help="number of REPL inputs whose parsed AST is kept (default: 256)")
+    arg_parser.add_argument('--profile', action='store_true',
+                            help="print per-function call counts and timings after the script (tree engine)")
+    arg_parser.add_argument('--profile-output', metavar='FILE',
+                            help="also write the profile to FILE: JSON if it ends in .json, "
+                                 "otherwise a pstats file (implies --profile)")
+    arg_parser.add_argument('-j', '--jobs', type=int, metavar='N',
+                            help="evaluate independent statements in N worker processes")
+    arg_parser.add_argument('--jit', action='store_true',
+                            help="compile frequently called functions to Python code (tree engine)")
+    arg_parser.add_argument('--jit-dump', action='store_true',
+                            help="print the Python source of every function the JIT compiles "
+                                 "to stderr (implies --jit)")
+    arg_parser.add_argument('--reactive', action='store_true',
+                            help="in the REPL, recompute the globals that depend on a redefined "
+                                 "variable or function (tree engine)")
+    args = arg_parser.parse_args()
+    profile = args.profile or bool(args.profile_output)
+    if profile and (args.engine != 'tree' or not args.file or args.jobs):
+        arg_parser.error("--profile needs a script, the tree engine and no --jobs")
+    jit = args.jit or args.jit_dump
+    if jit and (args.engine != 'tree' or profile or args.jobs):
+        arg_parser.error("--jit needs the tree engine and no --profile or --jobs")
+    if args.reactive and (args.engine != 'tree' or args.file):
+        arg_parser.error("--reactive needs the REPL and the tree engine")
+    if args.file:
+        cache = ProgramCache(args.cache_dir) if args.cache or args.cache_dir else None
+        run_file(args.file, engine=args.engine, optimize=args.optimize, cache=cache,
+                 profile=profile, profile_output=args.profile_output, jobs=args.jobs,
+                 jit=jit, jit_dump=args.jit_dump, reactive=args.reactive)
     else:
-        main()
+        main(engine=args.engine, optimize=args.optimize, parse_cache_size=args.parse_cache_size,
+             jit=jit, jit_dump=args.jit_dump, reactive=args.reactive)
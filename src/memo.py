@@ -0,0 +1,103 @@
+from collections import OrderedDict
+
+from analysis import function_dependencies
+
+MISSING = object()
+
+
+class FunctionCache:
+    """LRU cache of results for one function, keyed by argument tuples."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return entries[key]
+        self.misses += 1
+        return MISSING
+
+    def put(self, key, value):
+        entries = self.entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self.entries), 'maxsize': self.maxsize}
+
+
+class Memoizer:
+    """Caches results of pure user functions.
+
+    A function is pure when neither it nor any function it (transitively)
+    calls defines a function. Pure functions may still read global
+    variables; their cache is dropped when one of those variables, the
+    function itself or any function it calls is redefined.
+
+    ``functions`` is True to memoize every pure function, or a collection
+    of function names to opt in individually.
+    """
+
+    def __init__(self, functions=True, maxsize=1024):
+        self.enabled = functions if functions is True else set(functions)
+        self.maxsize = maxsize
+        self.dependencies = {}
+        self.caches = {}
+        self.watched = {}
+
+    def define_function(self, func_def):
+        self.dependencies[func_def.name] = function_dependencies(func_def)
+        self.invalidate(func_def.name, functions=True)
+
+    def define_variable(self, name):
+        self.invalidate(name, functions=False)
+
+    def invalidate(self, name, functions):
+        for cached_name, (variables, called) in list(self.watched.items()):
+            if name in (called if functions else variables):
+                del self.watched[cached_name]
+                self.caches.pop(cached_name, None)
+
+    def cache_for(self, name):
+        try:
+            return self.caches[name]
+        except KeyError:
+            pass
+        variables, functions, pure = self.closure(name)
+        cache = None
+        if pure and (self.enabled is True or name in self.enabled):
+            cache = FunctionCache(self.maxsize)
+        self.watched[name] = (variables, functions)
+        self.caches[name] = cache
+        return cache
+
+    def closure(self, name):
+        """Return the variables and functions reached from ``name`` and whether all are pure."""
+        variables = set()
+        functions = set()
+        pure = True
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            if current in functions:
+                continue
+            functions.add(current)
+            deps = self.dependencies.get(current)
+            if deps is None or deps.defines:
+                pure = False
+                continue
+            variables |= deps.variables
+            pending.extend(deps.functions)
+        return variables, functions, pure
+
+    def stats(self):
+        return {name: cache.stats() for name, cache in self.caches.items() if cache is not None}
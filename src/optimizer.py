@@ -0,0 +1,128 @@
+from token_types import TokenType
+from ast_nodes import (Number, BinaryOp, Identifier, FunctionDef,
+                       FunctionCall, IfExpr, Comparison, LetStatement, LetExpression, Block)
+
+
+class Optimizer:
+    """Rewrites an AST into an equivalent, cheaper one before interpretation.
+
+    - folds BinaryOp/Comparison nodes whose operands are constants
+    - prunes IfExpr branches whose condition is constant
+    - propagates constant let-expression bindings into their body
+    - drops identities: x + 0, 0 + x, x - 0, x * 1, 1 * x, x / 1
+
+    Division by a constant zero is never folded, so it still raises
+    "Division by zero" when (and only when) it is evaluated. Globals are not
+    propagated because they can be redefined later.
+    """
+
+    def optimize(self, tree):
+        return self.optimize_node(tree, {})
+
+    def optimize_node(self, node, constants):
+        method_name = f'optimize_{type(node).__name__}'
+        method = getattr(self, method_name, None)
+        if method is None:
+            raise Exception(f'No optimize_{type(node).__name__} method')
+        return method(node, constants)
+
+    def optimize_Number(self, node, constants):
+        return node
+
+    def optimize_Identifier(self, node, constants):
+        if node.name in constants:
+            return Number(constants[node.name])
+        return node
+
+    def optimize_BinaryOp(self, node, constants):
+        left = self.optimize_node(node.left, constants)
+        right = self.optimize_node(node.right, constants)
+        op = node.operator
+        left_value = left.value if type(left) is Number else None
+        right_value = right.value if type(right) is Number else None
+
+        if left_value is not None and right_value is not None:
+            if op == TokenType.PLUS:
+                return Number(left_value + right_value)
+            if op == TokenType.MINUS:
+                return Number(left_value - right_value)
+            if op == TokenType.MULTIPLY:
+                return Number(left_value * right_value)
+            if op == TokenType.DIVIDE and right_value != 0:
+                return Number(left_value // right_value)
+
+        if op == TokenType.PLUS:
+            if right_value == 0:
+                return left
+            if left_value == 0:
+                return right
+        elif op == TokenType.MINUS and right_value == 0:
+            return left
+        elif op == TokenType.MULTIPLY:
+            if right_value == 1:
+                return left
+            if left_value == 1:
+                return right
+        elif op == TokenType.DIVIDE and right_value == 1:
+            return left
+
+        if left is node.left and right is node.right:
+            return node
+        return BinaryOp(left, op, right)
+
+    def optimize_Comparison(self, node, constants):
+        left = self.optimize_node(node.left, constants)
+        right = self.optimize_node(node.right, constants)
+        if (node.operator == TokenType.EQUALS
+                and type(left) is Number and type(right) is Number):
+            return Number(1 if left.value == right.value else 0)
+        if left is node.left and right is node.right:
+            return node
+        return Comparison(left, node.operator, right)
+
+    def optimize_IfExpr(self, node, constants):
+        condition = self.optimize_node(node.condition, constants)
+        if type(condition) is Number:
+            branch = node.true_branch if condition.value != 0 else node.false_branch
+            return self.optimize_node(branch, constants)
+        true_branch = self.optimize_node(node.true_branch, constants)
+        false_branch = self.optimize_node(node.false_branch, constants)
+        if (condition is node.condition and true_branch is node.true_branch
+                and false_branch is node.false_branch):
+            return node
+        return IfExpr(condition, true_branch, false_branch)
+
+    def optimize_LetExpression(self, node, constants):
+        value = self.optimize_node(node.value, constants)
+        if type(value) is Number:
+            return self.optimize_node(node.body, {**constants, node.name: value.value})
+        if node.name in constants:
+            constants = {name: constant for name, constant in constants.items() if name != node.name}
+        body = self.optimize_node(node.body, constants)
+        if value is node.value and body is node.body:
+            return node
+        return LetExpression(node.name, value, body)
+
+    def optimize_LetStatement(self, node, constants):
+        value = self.optimize_node(node.value, constants)
+        if value is node.value:
+            return node
+        return LetStatement(node.name, value)
+
+    def optimize_FunctionDef(self, node, constants):
+        body = self.optimize_node(node.body, {})
+        if body is node.body:
+            return node
+        return FunctionDef(node.name, node.params, body)
+
+    def optimize_FunctionCall(self, node, constants):
+        arguments = [self.optimize_node(arg, constants) for arg in node.arguments]
+        if all(new is old for new, old in zip(arguments, node.arguments)):
+            return node
+        return FunctionCall(node.name, arguments)
+
+    def optimize_Block(self, node, constants):
+        statements = [self.optimize_node(stmt, constants) for stmt in node.statements]
+        if all(new is old for new, old in zip(statements, node.statements)):
+            return node
+        return Block(statements)
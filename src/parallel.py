@@ -0,0 +1,143 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from ast_nodes import FunctionDef, LetStatement, Block
+from analysis import collect_dependencies, function_dependencies
+
+
+def evaluate(engine, statement, variables, functions):
+    """Run one statement on a fresh ``engine`` holding the given globals.
+
+    Returns (ok, result or error message, interpreter); the interpreter is
+    left out when called in a worker process.
+    """
+    interpreter = engine()
+    interpreter.global_env.variables.update(variables)
+    try:
+        for func_def in functions:
+            interpreter.interpret(func_def)
+        return True, interpreter.interpret(statement), interpreter
+    except Exception as e:
+        return False, str(e), interpreter
+
+
+def evaluate_remote(engine, statement, variables, functions):
+    ok, result, interpreter = evaluate(engine, statement, variables, functions)
+    value = None
+    if ok and type(statement) is LetStatement:
+        value = interpreter.global_env.variables[statement.name]
+    return ok, result, value
+
+
+class Pending:
+    """A global whose value is still being computed by a worker."""
+
+    def __init__(self, future, previous):
+        self.future = future
+        self.previous = previous
+
+
+MISSING = object()
+
+
+class ParallelRunner:
+    """Evaluates the top-level statements of a script across worker processes.
+
+    Statements are visited in source order while a table of global bindings
+    is kept as of that point in the program. A pure statement that calls
+    user functions is sent to the pool with just the globals and function
+    definitions it can reach. A binding it needs that is still being
+    computed is waited for first, so dependent statements see exactly what
+    a sequential run would. Function definitions, cheap expressions and
+    statements that define functions (directly or through a call) run in
+    this process. Results are returned in source order.
+    """
+
+    def __init__(self, engine, workers=None):
+        self.engine = engine
+        self.workers = workers or os.cpu_count() or 1
+        self.variables = {}
+        self.functions = {}
+
+    def run(self, statements):
+        """Return a list of (line, ok, result or error message) for ``statements``."""
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        outcomes = []
+        with ProcessPoolExecutor(self.workers, mp_context=context) as pool:
+            for line_num, statement in statements:
+                if isinstance(statement, Exception):
+                    outcomes.append((line_num, (False, str(statement))))
+                else:
+                    outcomes.append((line_num, self.submit(pool, statement)))
+            return [(line_num, *self.outcome(result)) for line_num, result in outcomes]
+
+    def submit(self, pool, statement):
+        if type(statement) is FunctionDef:
+            ok, result, _ = evaluate(self.engine, statement, {}, [])
+            if ok:
+                self.functions[statement.name] = statement
+            return ok, result
+
+        deps = collect_dependencies(statement)
+        functions = self.reachable_functions(deps.functions)
+        pure = (type(statement) is not Block and not deps.defines
+                and not any(function_dependencies(f).defines for f in functions))
+        if not pure:
+            return self.run_here(statement, self.variables, self.functions.values(), sync=True)
+
+        variables = set(deps.variables)
+        for func_def in functions:
+            variables |= function_dependencies(func_def).variables
+        snapshot = {}
+        for name in variables:
+            value = self.value_of(self.variables.get(name, MISSING))
+            if value is not MISSING:
+                snapshot[name] = value
+
+        if not deps.functions:
+            return self.run_here(statement, snapshot, functions)
+        future = pool.submit(evaluate_remote, self.engine, statement, snapshot, functions)
+        if type(statement) is LetStatement:
+            self.variables[statement.name] = Pending(future, self.variables.get(statement.name, MISSING))
+        return future
+
+    def run_here(self, statement, variables, functions, sync=False):
+        if sync:
+            variables = {name: self.value_of(binding) for name, binding in variables.items()}
+            variables = {name: value for name, value in variables.items() if value is not MISSING}
+        ok, result, interpreter = evaluate(self.engine, statement, variables, list(functions))
+        if sync:
+            self.variables = dict(interpreter.global_env.variables)
+            self.functions = dict(interpreter.global_env.functions)
+        elif ok and type(statement) is LetStatement:
+            self.variables[statement.name] = interpreter.global_env.variables[statement.name]
+        return ok, result
+
+    def reachable_functions(self, names):
+        found = {}
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name in found or name not in self.functions:
+                continue
+            found[name] = self.functions[name]
+            pending.extend(function_dependencies(found[name]).functions)
+        return list(found.values())
+
+    @staticmethod
+    def value_of(binding):
+        while type(binding) is Pending:
+            ok, _, value = binding.future.result()
+            if ok:
+                return value
+            binding = binding.previous
+        return binding
+
+    @staticmethod
+    def outcome(result):
+        if type(result) is tuple:
+            return result
+        ok, text, _ = result.result()
+        return ok, text
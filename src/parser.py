@@ -1,20 +1,71 @@
-from token_types import TokenType
+from token_types import TokenType, Token
+from lexer import Lexer
 from ast_nodes import (Number, BinaryOp, Identifier, FunctionDef,
                        FunctionCall, IfExpr, Comparison, LetStatement, LetExpression, Block)
 
+COMPARISON_PRECEDENCE = 1
+
+BINARY_OPERATORS = {
+    TokenType.EQUALS: (COMPARISON_PRECEDENCE, Comparison),
+    TokenType.PLUS: (2, BinaryOp),
+    TokenType.MINUS: (2, BinaryOp),
+    TokenType.MULTIPLY: (3, BinaryOp),
+    TokenType.DIVIDE: (3, BinaryOp),
+}
+
+# In statements(), a line break ends the statement unless it comes inside
+# brackets or braces, right after one of CONTINUE_AFTER or right before one
+# of CONTINUE_BEFORE, which cannot start a statement.
+OPENERS = frozenset({TokenType.LPAREN, TokenType.LBRACE})
+CLOSERS = frozenset({TokenType.RPAREN, TokenType.RBRACE})
+CONTINUE_AFTER = frozenset({TokenType.ASSIGN, TokenType.THEN, TokenType.ELSE, TokenType.IN})
+CONTINUE_BEFORE = frozenset({TokenType.THEN, TokenType.ELSE, TokenType.IN, TokenType.EOF})
+
 class Parser:
     def __init__(self, tokens):
-        self.tokens = tokens
+        # Any iterable of tokens works: a list from Lexer.tokenize() or the
+        # lazy Lexer.tokens() stream, which is consumed one token at a time.
+        self.tokens = iter(tokens)
         self.pos = 0
-        self.current_token = self.tokens[0] if tokens else None
+        self.current_token = next(self.tokens, None)
+        self.previous_token = None
+        self.lexer = None
+        # Bracket depth while statements() is reading, None otherwise.
+        self.depth = None
+        self.held = None
+
+    @classmethod
+    def from_source(cls, text):
+        """Create a parser for a whole program, read with statements() or parse_program()."""
+        parser = cls(())
+        parser.lexer = Lexer(text)
+        parser.tokens = parser.lexer.tokens()
+        return parser
     
     def error(self, msg="Invalid syntax"):
         raise Exception(f'{msg} at position {self.pos}, token: {self.current_token}')
     
     def advance(self):
         self.pos += 1
-        if self.pos < len(self.tokens):
-            self.current_token = self.tokens[self.pos]
+        self.previous_token = self.current_token
+        token = next(self.tokens, None)
+        if token is not None:
+            if self.depth is not None:
+                token = self.check_line_break(token)
+            self.current_token = token
+
+    def check_line_break(self, token):
+        """Return ``token``, or a NEWLINE standing in for it if the line break before it ends the statement."""
+        previous = self.previous_token
+        if previous.type in OPENERS:
+            self.depth += 1
+        elif previous.type in CLOSERS:
+            self.depth -= 1
+        if (token.line == previous.line or self.depth > 0
+                or previous.type in CONTINUE_AFTER or token.type in CONTINUE_BEFORE):
+            return token
+        self.held = token
+        return Token(TokenType.NEWLINE, None, token.position, token.line)
     
     def eat(self, token_type):
         if self.current_token.type == token_type:
@@ -22,25 +73,19 @@ class Parser:
         else:
             self.error(f"Expected {token_type}, got {self.current_token.type}")
     
-    def factor(self):
+    def primary(self):
         token = self.current_token
         
         if token.type == TokenType.NUMBER:
-            self.eat(TokenType.NUMBER)
+            self.advance()
             return Number(token.value)
         
         elif token.type == TokenType.IDENTIFIER:
-            self.eat(TokenType.IDENTIFIER)
+            self.advance()
             return Identifier(token.value)
         
-        elif token.type == TokenType.LPAREN:
-            self.eat(TokenType.LPAREN)
-            node = self.expr()
-            self.eat(TokenType.RPAREN)
-            return node
-        
         elif token.type == TokenType.HASH:
-            self.eat(TokenType.HASH)
+            self.advance()
             func_name = self.current_token.value
             self.eat(TokenType.IDENTIFIER)
             self.eat(TokenType.LPAREN)
@@ -50,43 +95,70 @@ class Parser:
         
         self.error("Expected number, identifier, or expression")
     
-    def term(self):
-        node = self.factor()
-        
-        while self.current_token.type in (TokenType.MULTIPLY, TokenType.DIVIDE):
-            op_token = self.current_token
-            if op_token.type == TokenType.MULTIPLY:
-                self.eat(TokenType.MULTIPLY)
-            elif op_token.type == TokenType.DIVIDE:
-                self.eat(TokenType.DIVIDE)
-            
-            node = BinaryOp(left=node, operator=op_token.type, right=self.factor())
-        
-        return node
-    
-    def arith_expr(self):
-        node = self.term()
+    def binary_expr(self):
+        """Parse operators and parentheses with explicit operand/operator stacks.
+
+        Precedence comes from BINARY_OPERATORS; operators of equal precedence
+        associate to the left, except ``==`` which does not chain. A ``(``
+        pushes a marker instead of recursing, so nesting depth is not limited
+        by the Python stack. Only a parenthesized ``if``/``let`` recurses into
+        expr().
+        """
+        operands = []
+        operators = []
+        depth = 0
         
-        while self.current_token.type in (TokenType.PLUS, TokenType.MINUS):
-            op_token = self.current_token
-            if op_token.type == TokenType.PLUS:
-                self.eat(TokenType.PLUS)
-            elif op_token.type == TokenType.MINUS:
-                self.eat(TokenType.MINUS)
+        while True:
+            node = None
+            while node is None:
+                if self.current_token.type == TokenType.LPAREN:
+                    self.advance()
+                    if self.current_token.type in (TokenType.IF, TokenType.LET):
+                        node = self.expr()
+                        self.eat(TokenType.RPAREN)
+                    else:
+                        operators.append(None)
+                        depth += 1
+                else:
+                    node = self.primary()
+            operands.append(node)
             
-            node = BinaryOp(left=node, operator=op_token.type, right=self.term())
-        
-        return node
+            while True:
+                op_type = self.current_token.type
+                entry = BINARY_OPERATORS.get(op_type)
+                if entry is not None:
+                    precedence = entry[0]
+                    while operators:
+                        top = operators[-1]
+                        if top is None or top[0] < precedence:
+                            break
+                        if top[0] == precedence == COMPARISON_PRECEDENCE:
+                            entry = None
+                            break
+                        self.reduce(operands, operators)
+                    if entry is not None:
+                        self.advance()
+                        operators.append((precedence, entry[1], op_type))
+                        break
+                elif op_type == TokenType.RPAREN and depth:
+                    while operators[-1] is not None:
+                        self.reduce(operands, operators)
+                    operators.pop()
+                    depth -= 1
+                    self.advance()
+                    continue
+                
+                if depth:
+                    self.eat(TokenType.RPAREN)
+                while operators:
+                    self.reduce(operands, operators)
+                return operands[0]
     
-    def comparison(self):
-        node = self.arith_expr()
-        
-        if self.current_token.type == TokenType.EQUALS:
-            op_token = self.current_token
-            self.eat(TokenType.EQUALS)
-            node = Comparison(left=node, operator=op_token.type, right=self.arith_expr())
-        
-        return node
+    @staticmethod
+    def reduce(operands, operators):
+        _, node_class, op_type = operators.pop()
+        right = operands.pop()
+        operands[-1] = node_class(left=operands[-1], operator=op_type, right=right)
     
     def expr(self):
         if self.current_token.type == TokenType.IF:
@@ -111,7 +183,7 @@ class Parser:
             else:
                 raise Exception("let without 'in' is not allowed in expression context. Use 'let x = ... in ...'")
         
-        return self.comparison()
+        return self.binary_expr()
     
     def arguments(self):
         args = []
@@ -174,3 +246,50 @@ class Parser:
         if self.current_token.type != TokenType.EOF:
             self.error("Expected end of input")
         return node
+
+    def statements(self, recover=False):
+        """Yield (line, statement) pairs for every top-level statement until EOF.
+
+        Statements may span several lines, but each one must start on a new
+        line, and a line break ends a statement except inside brackets or
+        braces, after ``=`` and around ``then``, ``else`` and ``in``; a
+        dangling operator at the end of a line is a syntax error. With ``recover`` a
+        syntax error is yielded as (line, exception) and parsing resumes on
+        the line of the offending token, or on the next line if that is the
+        line the statement started on; this requires a parser created with
+        from_source().
+        """
+        self.depth = 0
+        while True:
+            line = None
+            try:
+                if self.current_token is None:
+                    self.current_token = next(self.tokens)
+                elif self.current_token.type == TokenType.NEWLINE:
+                    self.current_token = self.held
+                if self.current_token.type == TokenType.EOF:
+                    return
+                line = self.current_token.line
+                self.depth = 0
+                node = self.statement()
+                if self.current_token.type not in (TokenType.NEWLINE, TokenType.EOF):
+                    self.error("Expected end of line")
+            except Exception as e:
+                if not recover or self.lexer is None:
+                    raise
+                yield (line or self.lexer.line), e
+                token = self.current_token
+                if token is not None and token.type == TokenType.NEWLINE:
+                    token = self.held
+                if (self.lexer.current_char is None and token is not None
+                        and line is not None and token.line > line):
+                    self.lexer.seek_line(token.position, token.line)
+                else:
+                    self.lexer.skip_line()
+                self.tokens = self.lexer.tokens()
+                self.current_token = None
+                continue
+            yield line, node
+
+    def parse_program(self):
+        return list(self.statements())
@@ -0,0 +1,150 @@
+import json
+import marshal
+import time
+
+
+class FunctionStats:
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.primitive_calls = 0
+        self.inclusive = 0.0
+        self.exclusive = 0.0
+        self.depth = 0
+        self.max_depth = 0
+        self.callers = {}
+
+    def as_dict(self):
+        return {
+            'function': self.name,
+            'calls': self.calls,
+            'inclusive': self.inclusive,
+            'exclusive': self.exclusive,
+            'max_depth': self.max_depth,
+        }
+
+
+class Profiler:
+    """Records call counts, wall time and recursion depth for user functions.
+
+    install() wraps run_body on one Interpreter instance with enter/exit
+    hooks; the trampoline calls run_body once per activation, so every call
+    is seen while interpreters that are not profiled run the unmodified
+    method. Calls answered from the memo cache do not run a body and are not
+    counted.
+
+    Inclusive time counts each function once per outermost activation, so
+    recursive calls are not added twice; exclusive time leaves out the time
+    spent in the functions it calls. A tail call ends the caller's
+    activation before the callee's starts, as the trampoline reuses the
+    frame, so it does not add to the recursion depth either.
+    """
+
+    SORT_KEYS = ('inclusive', 'exclusive', 'calls', 'max_depth', 'function')
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.functions = {}
+        self.stack = []
+        self.previous = None
+
+    def install(self, interpreter):
+        self.previous = interpreter.__dict__.get('run_body')
+        run_body = interpreter.run_body
+        enter = self.enter
+        exit = self.exit
+
+        def profiled_run_body(func_def):
+            enter(func_def.name)
+            try:
+                return run_body(func_def)
+            finally:
+                exit()
+
+        interpreter.run_body = profiled_run_body
+        interpreter.profiler = self
+        return self
+
+    def uninstall(self, interpreter):
+        if self.previous is None:
+            interpreter.__dict__.pop('run_body', None)
+        else:
+            interpreter.run_body = self.previous
+        interpreter.profiler = None
+
+    def reset(self):
+        self.functions.clear()
+        self.stack.clear()
+
+    def enter(self, name):
+        stats = self.functions.get(name)
+        if stats is None:
+            stats = self.functions[name] = FunctionStats(name)
+        stats.calls += 1
+        if stats.depth == 0:
+            stats.primitive_calls += 1
+        stats.depth += 1
+        if stats.depth > stats.max_depth:
+            stats.max_depth = stats.depth
+        self.stack.append([stats, self.clock(), 0.0])
+
+    def exit(self):
+        stats, start, children = self.stack.pop()
+        elapsed = self.clock() - start
+        stats.depth -= 1
+        outermost = stats.depth == 0
+        if outermost:
+            stats.inclusive += elapsed
+        stats.exclusive += elapsed - children
+        caller = self.stack[-1][0].name if self.stack else None
+        edge = stats.callers.get(caller)
+        if edge is None:
+            edge = stats.callers[caller] = [0, 0, 0.0, 0.0]
+        edge[0] += 1
+        edge[1] += outermost
+        edge[2] += elapsed - children
+        if outermost:
+            edge[3] += elapsed
+        if self.stack:
+            self.stack[-1][2] += elapsed
+
+    def results(self, sort='inclusive'):
+        if sort not in self.SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort}")
+        rows = [stats.as_dict() for stats in self.functions.values()]
+        return sorted(rows, key=lambda row: row[sort], reverse=sort != 'function')
+
+    def format_table(self, sort='inclusive'):
+        lines = [f"{'function':<20} {'calls':>8} {'inclusive ms':>13} "
+                 f"{'exclusive ms':>13} {'ms/call':>10} {'max depth':>10}"]
+        for row in self.results(sort):
+            per_call = row['inclusive'] / row['calls'] if row['calls'] else 0.0
+            lines.append(f"{row['function']:<20} {row['calls']:>8} {row['inclusive'] * 1000:>13.3f} "
+                         f"{row['exclusive'] * 1000:>13.3f} {per_call * 1000:>10.4f} "
+                         f"{row['max_depth']:>10}")
+        return '\n'.join(lines)
+
+    def to_json(self, sort='inclusive'):
+        return json.dumps({'unit': 'seconds', 'functions': self.results(sort)}, indent=2)
+
+    def pstats_data(self, filename='<nitlang>'):
+        """Return the stats in the format pstats.Stats reads from a marshal file."""
+        def key(name):
+            return (filename, 0, name)
+
+        data = {}
+        for stats in self.functions.values():
+            callers = {key(caller if caller is not None else '<module>'): tuple(edge)
+                       for caller, edge in stats.callers.items()}
+            data[key(stats.name)] = (stats.primitive_calls, stats.calls,
+                                     stats.exclusive, stats.inclusive, callers)
+        return data
+
+    def dump(self, path, filename='<nitlang>'):
+        """Write JSON when ``path`` ends in .json, otherwise a pstats-compatible file."""
+        if path.endswith('.json'):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.to_json())
+        else:
+            with open(path, 'wb') as f:
+                marshal.dump(self.pstats_data(filename), f)
@@ -0,0 +1,145 @@
+from analysis import collect_dependencies, function_dependencies
+
+
+def function_key(name):
+    # Functions and variables have separate namespaces; functions are
+    # tracked under their call syntax.
+    return f"#{name}"
+
+
+class Definition:
+    def __init__(self, node, frame):
+        self.node = node
+        self.frame = frame
+        deps = collect_dependencies(node.value)
+        self.variables = deps.variables
+        self.functions = deps.functions
+
+
+class Reactive:
+    """Keeps global variables up to date with the globals their definitions read.
+
+    Every global let statement is recorded with its value expression and
+    the variables and functions it reads. When a variable or function is
+    redefined, the globals that depend on it, directly or through the
+    functions they call, are evaluated again in dependency order and each
+    changed value is reported as a line. Globals whose inputs kept their
+    value are left alone, so only the part of the graph that actually
+    changed is recomputed.
+
+    Function bodies are analysed when a change happens, so the graph
+    follows later function redefinitions. A definition that reads its own
+    variable (``let x = x + 1``) is an update, not a formula, and is not
+    recorded.
+    """
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.definitions = {}
+        self.updating = False
+
+    def define_variable(self, node):
+        """Record the definition ``node`` just assigned and update its dependents."""
+        if self.updating:
+            return []
+        self.definitions.pop(node.name, None)
+        definition = Definition(node, list(self.interpreter.frame))
+        if node.name not in self.reads(definition, {}):
+            self.definitions[node.name] = definition
+        return self.update({node.name})
+
+    def define_function(self, names):
+        """Update the variables that call any of the functions ``names``."""
+        if self.updating:
+            return []
+        return self.update({function_key(name) for name in names})
+
+    def reads(self, definition, cache):
+        """The variables and functions ``definition`` reads, including through calls."""
+        functions = self.interpreter.global_env.functions
+        reads = set(definition.variables)
+        pending = list(definition.functions)
+        seen = set()
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            reads.add(function_key(name))
+            func_def = functions.get(name)
+            if func_def is None:
+                continue
+            if func_def not in cache:
+                cache[func_def] = function_dependencies(func_def)
+            deps = cache[func_def]
+            reads |= deps.variables
+            pending.extend(deps.functions)
+        return reads
+
+    def order(self, changed):
+        """The recorded variables depending on the ``changed`` names, each after the ones it reads."""
+        cache = {}
+        reads = {name: self.reads(definition, cache) for name, definition in self.definitions.items()}
+        affected = set(changed)
+        grown = True
+        while grown:
+            grown = False
+            for name, names in reads.items():
+                if name not in affected and names & affected:
+                    affected.add(name)
+                    grown = True
+        affected -= changed
+
+        order = []
+        visited = set()
+
+        def visit(name):
+            visited.add(name)
+            for dependency in sorted(reads[name] & affected):
+                if dependency not in visited:
+                    visit(dependency)
+            order.append(name)
+
+        for name in self.definitions:
+            if name in affected and name not in visited:
+                visit(name)
+        return [(name, reads[name]) for name in order]
+
+    def update(self, changed):
+        interpreter = self.interpreter
+        variables = interpreter.global_env.variables
+        dirty = set(changed)
+        failed = set()
+        report = []
+        self.updating = True
+        try:
+            for name, reads in self.order(changed):
+                if not reads & dirty and not reads & failed:
+                    continue
+                broken = sorted(reads & failed)
+                if broken:
+                    failed.add(name)
+                    report.append(f"Variable '{name}' not updated: depends on '{broken[0]}'")
+                    continue
+                definition = self.definitions[name]
+                previous_frame = interpreter.frame
+                interpreter.frame = list(definition.frame)
+                try:
+                    value = interpreter.visit(definition.node.value)
+                except Exception as e:
+                    failed.add(name)
+                    report.append(f"Variable '{name}' not updated: {e}")
+                    continue
+                finally:
+                    interpreter.frame = previous_frame
+                old = variables.get(name)
+                if value == old:
+                    continue
+                interpreter.global_env.define_variable(name, value)
+                if interpreter.memo is not None:
+                    interpreter.memo.define_variable(name)
+                dirty.add(name)
+                report.append(f"Variable '{name}' = {value} (was {old})")
+        finally:
+            self.updating = False
+        return report
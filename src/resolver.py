@@ -0,0 +1,92 @@
+from ast_nodes import (Number, BinaryOp, Identifier, FunctionDef,
+                       FunctionCall, IfExpr, Comparison, LetStatement, LetExpression, Block)
+
+
+class Resolver:
+    """Assigns every local name a slot in its function's frame before evaluation.
+
+    NITLang functions cannot capture variables from an enclosing function, so
+    a name is either local to the running frame or global: parameters, let
+    expressions and block-level let statements get a slot index, written to
+    the ``slot`` field of Identifier/LetExpression/LetStatement nodes, and
+    everything else keeps ``slot = None`` and is looked up in the globals.
+    The frame size is stored on each FunctionDef.
+
+    An unknown global is not an error here: it is only reported as undefined
+    when evaluation actually reads it, so a branch that never runs may name
+    a variable that does not exist.
+    """
+
+    def __init__(self):
+        self.scopes = None
+        self.size = 0
+        self.in_function = False
+
+    def resolve(self, tree):
+        """Resolve a top-level statement and return the frame size it needs."""
+        return self._resolve_code([], tree, in_function=False)
+
+    def resolve_function(self, node):
+        node.frame_size = self._resolve_code(node.params, node.body, in_function=True)
+
+    def _resolve_code(self, params, body, in_function):
+        saved = (self.scopes, self.size, self.in_function)
+        self.scopes = [{param: slot for slot, param in enumerate(params)}]
+        self.size = len(params)
+        self.in_function = in_function
+        try:
+            self.resolve_node(body)
+            return self.size
+        finally:
+            self.scopes, self.size, self.in_function = saved
+
+    def new_slot(self):
+        self.size += 1
+        return self.size - 1
+
+    def lookup(self, name):
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return None
+
+    def resolve_node(self, node):
+        node_type = type(node)
+        if node_type is Number:
+            return
+        if node_type is Identifier:
+            node.slot = self.lookup(node.name)
+        elif node_type is BinaryOp or node_type is Comparison:
+            self.resolve_node(node.left)
+            self.resolve_node(node.right)
+        elif node_type is IfExpr:
+            self.resolve_node(node.condition)
+            self.resolve_node(node.true_branch)
+            self.resolve_node(node.false_branch)
+        elif node_type is LetExpression:
+            self.resolve_node(node.value)
+            node.slot = self.new_slot()
+            self.scopes.append({node.name: node.slot})
+            try:
+                self.resolve_node(node.body)
+            finally:
+                self.scopes.pop()
+        elif node_type is LetStatement:
+            self.resolve_node(node.value)
+            if self.in_function:
+                function_scope = self.scopes[0]
+                if node.name not in function_scope:
+                    function_scope[node.name] = self.new_slot()
+                node.slot = function_scope[node.name]
+            else:
+                node.slot = None
+        elif node_type is FunctionCall:
+            for arg in node.arguments:
+                self.resolve_node(arg)
+        elif node_type is FunctionDef:
+            self.resolve_function(node)
+        elif node_type is Block:
+            for stmt in node.statements:
+                self.resolve_node(stmt)
+        else:
+            raise Exception(f'Cannot resolve {type(node).__name__}')
@@ -0,0 +1,215 @@
+import asyncio
+import multiprocessing
+import signal
+
+from optimizer import Optimizer
+from cache import ParseCache
+from main import ENGINES
+
+
+# Seconds a session process gets past the timeout to stop by itself before it is killed.
+KILL_GRACE = 1.0
+
+
+class Session:
+    """One client's interpreter; its requests are evaluated one at a time.
+
+    With ``time_limit`` the tree engine stops an evaluation that runs
+    longer and reports it as an error; other engines run until the server
+    kills their process.
+    """
+
+    def __init__(self, engine, optimizer, parse_cache_size, time_limit=None):
+        options = {'time_limit': time_limit} if engine == 'tree' else {}
+        self.interpreter = ENGINES[engine](**options)
+        self.parse_cache = ParseCache(parse_cache_size, optimizer)
+
+    def evaluate(self, text):
+        return self.interpreter.interpret(self.parse_cache.parse(text))
+
+
+def session_main(conn, engine, optimize, parse_cache_size, time_limit):
+    """Answer statements received on ``conn`` with reply lines until it sends None or closes."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    session = Session(engine, Optimizer() if optimize else None, parse_cache_size, time_limit)
+    while True:
+        try:
+            text = conn.recv()
+        except EOFError:
+            break
+        if text is None:
+            break
+        try:
+            reply = f"OK {session.evaluate(text)}"
+        except Exception as e:
+            reply = f"ERR {e}"
+        conn.send(reply.replace('\n', ' '))
+
+
+class SessionProcess:
+    """A Session running in a child process, so a runaway evaluation can be killed."""
+
+    def __init__(self, context, engine, optimize, parse_cache_size, time_limit):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=session_main, args=(child_conn, engine, optimize, parse_cache_size, time_limit),
+            daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    async def evaluate(self, text, timeout):
+        """Return the reply line for ``text``, or None if the process died.
+
+        Raises asyncio.TimeoutError after ``timeout`` seconds.
+        """
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        fd = self.conn.fileno()
+        loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            self.conn.send(text)
+            await asyncio.wait_for(ready, timeout)
+        finally:
+            loop.remove_reader(fd)
+        try:
+            return self.conn.recv()
+        except (EOFError, OSError):
+            return None
+
+    def stop(self):
+        """Kill the process; a pending evaluate() then returns None."""
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+
+    def close(self):
+        self.stop()
+        self.conn.close()
+
+
+class EvaluationServer:
+    """Serves NITLang over a line protocol on a TCP or Unix socket.
+
+    Every line a client sends is one statement; the reply is one line,
+    ``OK <result>`` or ``ERR <message>``. ``exit`` closes the connection.
+    Each connection has its own session with its own globals and functions,
+    kept in a child process, so evaluations run in parallel without sharing
+    the GIL and the event loop keeps serving other clients while one of
+    them runs a long computation. At most ``workers`` evaluations run at a
+    time; further requests wait for a free slot.
+
+    A request that takes longer than ``timeout`` seconds is answered with an
+    error. The tree engine stops at that deadline by itself and the session
+    carries on; a session that is still busy KILL_GRACE seconds later, as
+    other engines are, is killed and its connection closed, since its state
+    is lost with it.
+    """
+
+    def __init__(self, engine='tree', optimize=False, workers=4, timeout=5.0,
+                 parse_cache_size=256):
+        self.engine = engine
+        self.optimize = optimize
+        self.timeout = timeout
+        self.parse_cache_size = parse_cache_size
+        self.slots = asyncio.Semaphore(workers)
+        # A forked child would hold on to the sockets of every open
+        # connection; the fork server starts sessions from a clean process
+        # that has already imported this module.
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            self.context = multiprocessing.get_context('forkserver')
+            self.context.set_forkserver_preload([session_main.__module__])
+        else:
+            self.context = multiprocessing.get_context('spawn')
+        self.server = None
+        self.sessions = set()
+        self.connections = {}
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle, path=path)
+        else:
+            self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server
+
+    @property
+    def address(self):
+        return self.server.sockets[0].getsockname()
+
+    async def close(self):
+        """Stop accepting clients, end every session and wait for the connections to close."""
+        if self.server is not None:
+            self.server.close()
+        for session in self.sessions:
+            session.stop()
+        for writer in self.connections.values():
+            writer.close()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+        if self.server is not None:
+            await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        session = SessionProcess(self.context, self.engine, self.optimize, self.parse_cache_size,
+                                 self.timeout)
+        task = asyncio.current_task()
+        self.sessions.add(session)
+        self.connections[task] = writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                text = line.decode('utf-8', errors='replace').strip()
+                if not text:
+                    continue
+                if text.lower() == 'exit':
+                    break
+                try:
+                    async with self.slots:
+                        reply = await session.evaluate(text, self.timeout + KILL_GRACE)
+                except asyncio.TimeoutError:
+                    writer.write(f"ERR Timeout after {self.timeout}s\n".encode('utf-8'))
+                    await writer.drain()
+                    break
+                if reply is None:
+                    writer.write(b"ERR Session ended unexpectedly\n")
+                    await writer.drain()
+                    break
+                writer.write(reply.encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions.discard(session)
+            self.connections.pop(task, None)
+            session.close()
+            writer.close()
+
+
+async def serve(args):
+    server = EvaluationServer(args.engine, args.optimize, args.workers, args.timeout)
+    await server.start(args.host, args.port, args.unix)
+    print(f"NITLang server listening on {args.unix or server.address}")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+if __name__ == '__main__':
+    import argparse
+    arg_parser = argparse.ArgumentParser(description="NITLang evaluation server")
+    arg_parser.add_argument('--host', default='127.0.0.1', help="TCP host (default: 127.0.0.1)")
+    arg_parser.add_argument('--port', type=int, default=7777, help="TCP port (default: 7777)")
+    arg_parser.add_argument('--unix', metavar='PATH', help="listen on a Unix socket instead of TCP")
+    arg_parser.add_argument('--engine', choices=sorted(ENGINES), default='tree',
+                            help="execution engine (default: tree)")
+    arg_parser.add_argument('--optimize', action='store_true',
+                            help="constant-fold and simplify each statement before running it")
+    arg_parser.add_argument('--workers', type=int, default=4,
+                            help="evaluations allowed to run at the same time (default: 4)")
+    arg_parser.add_argument('--timeout', type=float, default=5.0,
+                            help="seconds allowed per request (default: 5)")
+    try:
+        asyncio.run(serve(arg_parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,160 @@
+import operator
+
+from token_types import TokenType
+from ast_nodes import (Number, BinaryOp, Identifier, FunctionDef, FunctionCall, IfExpr,
+                       Comparison, LetStatement, LetExpression, Block)
+from interpreter import Interpreter
+from closure_compiler import divide
+
+OPERATORS = {
+    TokenType.PLUS: operator.add,
+    TokenType.MINUS: operator.sub,
+    TokenType.MULTIPLY: operator.mul,
+    TokenType.DIVIDE: divide,
+    TokenType.EQUALS: lambda left, right: 1 if left == right else 0,
+}
+
+# Continuations, pushed on the work stack as (kind, data) tuples.
+APPLY = 0       # data: operator function; replaces the top two values with its result
+BRANCH = 1      # data: IfExpr; pops the condition and schedules a branch
+BIND = 2        # data: LetExpression; pops the value into its slot, schedules the body
+ASSIGN = 3      # data: LetStatement; pops the value and pushes the message
+DISCARD = 4     # drops the result of a statement inside a block
+CALL = 5        # data: (FunctionDef, argument count); enters the function
+RETURN = 6      # data: the caller's frame
+
+
+class StackInterpreter(Interpreter):
+    """Evaluates the resolved AST with explicit stacks instead of Python recursion.
+
+    visit() runs a loop over a work stack of nodes still to evaluate and
+    continuations saying what to do with their results, and a value stack
+    of results. A call saves the caller's frame in a RETURN continuation;
+    a call whose continuation is already a RETURN is in tail position and
+    replaces the current frame instead. Recursion depth is therefore
+    limited only by memory, e.g. a non-tail ``#sum(1000000)``.
+
+    Programs, globals and function definitions are shared with the tree
+    walker; the per-call hooks of its options (memoization, profiling,
+    limits) are not available in this engine.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+    def visit(self, node):
+        variables = self.global_env.variables
+        functions = self.global_env.functions
+        frame = self.frame
+        values = []
+        push = values.append
+        pop = values.pop
+        todo = [node]
+        schedule = todo.append
+        take = todo.pop
+
+        while todo:
+            item = take()
+            kind = type(item)
+
+            if kind is tuple:
+                action, data = item
+                if action == APPLY:
+                    right = pop()
+                    values[-1] = data(values[-1], right)
+                elif action == BRANCH:
+                    schedule(data.true_branch if pop() != 0 else data.false_branch)
+                elif action == CALL:
+                    func_def, argc = data
+                    if argc != len(func_def.params):
+                        raise Exception(
+                            f"Function '{func_def.name}' expects {len(func_def.params)} "
+                            f"arguments, got {argc}"
+                        )
+                    if argc:
+                        arguments = values[-argc:]
+                        del values[-argc:]
+                    else:
+                        arguments = []
+                    if func_def.frame_size > argc:
+                        arguments.extend([None] * (func_def.frame_size - argc))
+                    if not todo or type(todo[-1]) is not tuple or todo[-1][0] != RETURN:
+                        schedule((RETURN, frame))
+                    frame = arguments
+                    schedule(func_def.body)
+                elif action == RETURN:
+                    frame = data
+                elif action == BIND:
+                    frame[data.slot] = pop()
+                    schedule(data.body)
+                elif action == DISCARD:
+                    pop()
+                else:
+                    value = pop()
+                    if data.slot is not None:
+                        frame[data.slot] = value
+                    else:
+                        variables[data.name] = value
+                    push(f"Variable '{data.name}' = {value}")
+
+            elif kind is Identifier:
+                if item.slot is not None:
+                    push(frame[item.slot])
+                else:
+                    try:
+                        push(variables[item.name])
+                    except KeyError:
+                        raise Exception(f"Undefined variable: {item.name}") from None
+            elif kind is Number:
+                push(item.value)
+            elif kind is BinaryOp or kind is Comparison:
+                # Operands that are numbers or locals are read in place
+                # instead of going through the stacks.
+                left, right = item.left, item.right
+                op = OPERATORS.get(item.operator)
+                if op is None:
+                    if kind is Comparison:
+                        raise Exception(f"Unknown comparison operator: {item.operator}")
+                    op = lambda left, right: None
+                right_type = type(right)
+                if right_type is Number or right_type is Identifier and right.slot is not None:
+                    left_type = type(left)
+                    if left_type is Number or left_type is Identifier and left.slot is not None:
+                        push(op(left.value if left_type is Number else frame[left.slot],
+                                right.value if right_type is Number else frame[right.slot]))
+                        continue
+                schedule((APPLY, op))
+                schedule(right)
+                schedule(left)
+            elif kind is FunctionCall:
+                func_def = functions.get(item.name)
+                if func_def is None:
+                    raise Exception(f"Undefined function: {item.name}")
+                arguments = item.arguments
+                schedule((CALL, (func_def, len(arguments))))
+                for argument in reversed(arguments):
+                    schedule(argument)
+            elif kind is IfExpr:
+                schedule((BRANCH, item))
+                schedule(item.condition)
+            elif kind is LetExpression:
+                schedule((BIND, item))
+                schedule(item.value)
+            elif kind is LetStatement:
+                schedule((ASSIGN, item))
+                schedule(item.value)
+            elif kind is Block:
+                statements = item.statements
+                if not statements:
+                    push(None)
+                    continue
+                schedule(statements[-1])
+                for stmt in reversed(statements[:-1]):
+                    schedule((DISCARD, None))
+                    schedule(stmt)
+            elif kind is FunctionDef:
+                push(self.visit_FunctionDef(item))
+            else:
+                push(self.find_visitor(kind)(self, item))
+
+        return values[-1]
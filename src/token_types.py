@@ -26,14 +26,18 @@ class TokenType(Enum):
     LBRACE = "LBRACE"  
     RBRACE = "RBRACE" 
 
+    NEWLINE = "NEWLINE"
     EOF = "EOF"
 
 
 class Token:
-    def __init__(self, type, value, position):
+    __slots__ = ('type', 'value', 'position', 'line')
+
+    def __init__(self, type, value, position, line=1):
         self.type = type
         self.value = value
         self.position = position
+        self.line = line
 
     def __repr__(self):
         return f"Token({self.type}, {self.value}, pos={self.position})"
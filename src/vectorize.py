@@ -0,0 +1,271 @@
+import numpy as np
+
+from token_types import TokenType
+from ast_nodes import Block, LetStatement
+
+INT64_MIN = np.iinfo(np.int64).min
+INT64_MAX = np.iinfo(np.int64).max
+
+
+class Unsupported(Exception):
+    """Raised while compiling or running a function the vector backend cannot handle."""
+
+
+def merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return left | right
+
+
+def add(left, right):
+    result = left + right
+    return result, ((left ^ result) & (right ^ result)) < 0
+
+
+def subtract(left, right):
+    result = left - right
+    return result, ((left ^ right) & (left ^ result)) < 0
+
+
+def multiply(left, right):
+    result = left * right
+    safe_left = np.where(left == 0, 1, left)
+    overflow = ((left != 0) & (result // safe_left != right)) | ((left == -1) & (right == INT64_MIN))
+    return result, overflow
+
+
+def divide(left, right):
+    invalid = (right == 0) | ((left == INT64_MIN) & (right == -1))
+    return left // np.where(invalid, 1, right), invalid
+
+
+OPERATORS = {
+    TokenType.PLUS: add,
+    TokenType.MINUS: subtract,
+    TokenType.MULTIPLY: multiply,
+    TokenType.DIVIDE: divide,
+}
+
+
+class VectorFunction:
+    def __init__(self, definition, body, callees):
+        self.definition = definition
+        self.body = body
+        self.callees = callees
+
+    def __call__(self, global_env, columns):
+        env = dict(zip(self.definition.params, ((column, None) for column in columns)))
+        with np.errstate(over='ignore', divide='ignore'):
+            return self.body(global_env, env)
+
+
+class Vectorizer:
+    """Compiles straight-line NITLang functions into whole-array NumPy code.
+
+    A function qualifies when its body only uses numbers, names, arithmetic,
+    ``==``, if/let expressions, a block of local let statements ending in an
+    expression, and calls to other qualifying functions that are not
+    (mutually) recursive. Each compiled node returns an int64 array and a
+    boolean mask of rows that went wrong: division by zero and any int64
+    overflow, where NITLang integers would keep growing. IfExpr becomes
+    np.where and only keeps errors from the branch each row selects, so a
+    guarded division behaves as it does in the scalar interpreter. A let
+    keeps the errors of its value even when the name is never read, since
+    the scalar interpreter evaluates it either way.
+
+    call_batch() runs the masked rows again through the scalar interpreter,
+    which raises the same errors or computes exact big integers.
+    """
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.compiled = {}
+        self.compiling = []
+
+    def lookup(self, name):
+        """Return the VectorFunction for ``name``, or None if it does not qualify."""
+        functions = self.interpreter.global_env.functions
+        func_def = functions.get(name)
+        if func_def is None:
+            return None
+        cached = self.compiled.get(name)
+        if cached is not None and cached[0] is func_def and all(
+                functions.get(callee) is definition for callee, definition in cached[1].callees):
+            return cached[1]
+        try:
+            function = self.compile_function(func_def)
+        except Unsupported:
+            function = None
+        if function is None:
+            self.compiled.pop(name, None)
+            return None
+        self.compiled[name] = (func_def, function)
+        return function
+
+    def compile_function(self, func_def):
+        if func_def.name in self.compiling:
+            raise Unsupported(f"'{func_def.name}' is recursive")
+        self.compiling.append(func_def.name)
+        try:
+            callees = []
+            body = self.compile_body(func_def.body, callees)
+            return VectorFunction(func_def, body, callees)
+        finally:
+            self.compiling.pop()
+
+    def compile_body(self, node, callees):
+        if type(node) is not Block:
+            return self.compile_node(node, callees)
+        if not node.statements or type(node.statements[-1]) is LetStatement:
+            raise Unsupported("block does not end in an expression")
+        lets = []
+        for stmt in node.statements[:-1]:
+            if type(stmt) is not LetStatement:
+                raise Unsupported("only let statements may precede the result")
+            lets.append((stmt.name, self.compile_node(stmt.value, callees)))
+        result = self.compile_node(node.statements[-1], callees)
+
+        def block(global_env, env):
+            env = dict(env)
+            errors = None
+            for name, value in lets:
+                env[name] = value(global_env, env)
+                errors = merge(errors, env[name][1])
+            values, result_errors = result(global_env, env)
+            return values, merge(errors, result_errors)
+        return block
+
+    def compile_node(self, node, callees):
+        method = getattr(self, f'compile_{type(node).__name__}', None)
+        if method is None:
+            raise Unsupported(f"{type(node).__name__} cannot be vectorized")
+        return method(node, callees)
+
+    def compile_Number(self, node, callees):
+        if not INT64_MIN <= node.value <= INT64_MAX:
+            raise Unsupported("constant does not fit in int64")
+        value = (np.int64(node.value), None)
+        return lambda global_env, env: value
+
+    def compile_Identifier(self, node, callees):
+        name = node.name
+
+        def load(global_env, env):
+            if name in env:
+                return env[name]
+            value = global_env.variables.get(name)
+            if type(value) is not int or not INT64_MIN <= value <= INT64_MAX:
+                raise Unsupported(f"global '{name}' is not an int64")
+            return np.int64(value), None
+        return load
+
+    def compile_BinaryOp(self, node, callees):
+        left = self.compile_node(node.left, callees)
+        right = self.compile_node(node.right, callees)
+        op = OPERATORS[node.operator]
+
+        def binary(global_env, env):
+            left_values, left_errors = left(global_env, env)
+            right_values, right_errors = right(global_env, env)
+            values, errors = op(left_values, right_values)
+            return values, merge(merge(left_errors, right_errors), errors)
+        return binary
+
+    def compile_Comparison(self, node, callees):
+        if node.operator != TokenType.EQUALS:
+            raise Unsupported(f"Unknown comparison operator: {node.operator}")
+        left = self.compile_node(node.left, callees)
+        right = self.compile_node(node.right, callees)
+
+        def equals(global_env, env):
+            left_values, left_errors = left(global_env, env)
+            right_values, right_errors = right(global_env, env)
+            return (left_values == right_values).astype(np.int64), merge(left_errors, right_errors)
+        return equals
+
+    def compile_IfExpr(self, node, callees):
+        condition = self.compile_node(node.condition, callees)
+        true_branch = self.compile_node(node.true_branch, callees)
+        false_branch = self.compile_node(node.false_branch, callees)
+
+        def if_expr(global_env, env):
+            condition_values, condition_errors = condition(global_env, env)
+            mask = condition_values != 0
+            true_values, true_errors = true_branch(global_env, env)
+            false_values, false_errors = false_branch(global_env, env)
+            errors = None
+            if true_errors is not None or false_errors is not None:
+                errors = np.where(mask, False if true_errors is None else true_errors,
+                                  False if false_errors is None else false_errors)
+            return np.where(mask, true_values, false_values), merge(condition_errors, errors)
+        return if_expr
+
+    def compile_LetExpression(self, node, callees):
+        name = node.name
+        value = self.compile_node(node.value, callees)
+        body = self.compile_node(node.body, callees)
+
+        def let_expression(global_env, env):
+            bound = value(global_env, env)
+            values, errors = body(global_env, {**env, name: bound})
+            return values, merge(bound[1], errors)
+        return let_expression
+
+    def compile_FunctionCall(self, node, callees):
+        func_def = self.interpreter.global_env.functions.get(node.name)
+        if func_def is None or len(func_def.params) != len(node.arguments):
+            raise Unsupported(f"call to '{node.name}' cannot be vectorized")
+        function = self.compile_function(func_def)
+        callees.append((node.name, func_def))
+        callees.extend(function.callees)
+        arguments = [self.compile_node(arg, callees) for arg in node.arguments]
+        params = func_def.params
+        body = function.body
+
+        def call(global_env, env):
+            values = [argument(global_env, env) for argument in arguments]
+            errors = None
+            for _, argument_errors in values:
+                errors = merge(errors, argument_errors)
+            result_values, result_errors = body(global_env, dict(zip(params, values)))
+            return result_values, merge(errors, result_errors)
+        return call
+
+    def call_batch(self, name, columns):
+        """Evaluate ``name`` over ``columns`` with NumPy, or return None to use the scalar path."""
+        function = self.lookup(name)
+        if function is None or not columns:
+            return None
+        try:
+            arrays = [np.asarray(column) for column in columns]
+        except (OverflowError, TypeError, ValueError):
+            return None
+        # Floats, big Python ints (object arrays) and uint64 would be
+        # truncated or wrapped by a cast; the scalar path keeps them as given.
+        if not all(np.issubdtype(array.dtype, np.integer) and np.can_cast(array.dtype, np.int64)
+                   for array in arrays):
+            return None
+        arrays = [array.astype(np.int64, copy=False) for array in arrays]
+        size = len(arrays[0])
+        if any(array.ndim != 1 or len(array) != size for array in arrays):
+            return None
+        try:
+            values, errors = function(self.interpreter.global_env, arrays)
+        except Unsupported:
+            return None
+        values = np.array(np.broadcast_to(values, (size,)))
+        if errors is None or not errors.any():
+            return values
+
+        rows = np.flatnonzero(np.broadcast_to(errors, (size,)))
+        func_def = function.definition
+        call = self.interpreter.call_function
+        fallback = [call(func_def, [array[row].item() for array in arrays]) for row in rows]
+        if all(INT64_MIN <= result <= INT64_MAX for result in fallback):
+            values[rows] = fallback
+            return values
+        values = values.astype(object)
+        values[rows] = fallback
+        return values
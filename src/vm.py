@@ -0,0 +1,123 @@
+from compiler import (Compiler, LOAD_CONST, LOAD_LOCAL, STORE_LOCAL, LOAD_GLOBAL,
+                      STORE_GLOBAL, ADD, SUB, MUL, DIV, EQ, JUMP, JUMP_IF_FALSE,
+                      LOAD_FUNC, CALL, TAIL_CALL, RETURN, DEFINE_FUNCTION,
+                      LET_RESULT, POP, DUP)
+from interpreter import Environment
+
+
+class VM:
+    """Stack-based virtual machine executing code produced by the Compiler.
+
+    Calls push a frame onto an explicit frame stack instead of recursing in
+    Python, so recursion depth is bounded by memory rather than by the Python
+    recursion limit.
+    """
+
+    def __init__(self):
+        self.global_env = Environment()
+        self.compiler = Compiler()
+        self.functions = {}
+
+    def define_function(self, function):
+        self.functions[function.name] = function
+        self.global_env.define_function(function.name, function.definition)
+
+    def interpret(self, tree):
+        return self.run(self.compiler.compile(tree))
+
+    def run(self, code_object):
+        variables = self.global_env.variables
+        functions = self.functions
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        frames = []
+
+        instructions = code_object.instructions
+        consts = code_object.consts
+        names = code_object.names
+        local_slots = [None] * code_object.nlocals
+        pc = 0
+
+        while True:
+            op, arg = instructions[pc]
+            pc += 1
+
+            if op == LOAD_LOCAL:
+                push(local_slots[arg])
+            elif op == LOAD_CONST:
+                push(consts[arg])
+            elif op == JUMP_IF_FALSE:
+                if pop() == 0:
+                    pc = arg
+            elif op == EQ:
+                right = pop()
+                stack[-1] = 1 if stack[-1] == right else 0
+            elif op == SUB:
+                right = pop()
+                stack[-1] = stack[-1] - right
+            elif op == ADD:
+                right = pop()
+                stack[-1] = stack[-1] + right
+            elif op == MUL:
+                right = pop()
+                stack[-1] = stack[-1] * right
+            elif op == LOAD_FUNC:
+                function = functions.get(names[arg])
+                if function is None:
+                    raise Exception(f"Undefined function: {names[arg]}")
+                push(function)
+            elif op == CALL or op == TAIL_CALL:
+                if arg:
+                    args = stack[-arg:]
+                    del stack[-arg:]
+                else:
+                    args = []
+                function = pop()
+                if arg != function.nparams:
+                    raise Exception(
+                        f"Function '{function.name}' expects {function.nparams} "
+                        f"arguments, got {arg}"
+                    )
+                if op == CALL:
+                    frames.append((instructions, consts, names, local_slots, pc))
+                code = function.code
+                instructions = code.instructions
+                consts = code.consts
+                names = code.names
+                local_slots = args
+                if code.nlocals > arg:
+                    local_slots.extend([None] * (code.nlocals - arg))
+                pc = 0
+            elif op == RETURN:
+                if not frames:
+                    return pop()
+                instructions, consts, names, local_slots, pc = frames.pop()
+            elif op == JUMP:
+                pc = arg
+            elif op == STORE_LOCAL:
+                local_slots[arg] = pop()
+            elif op == LOAD_GLOBAL:
+                try:
+                    push(variables[names[arg]])
+                except KeyError:
+                    raise Exception(f"Undefined variable: {names[arg]}") from None
+            elif op == DIV:
+                right = pop()
+                if right == 0:
+                    raise Exception("Division by zero")
+                stack[-1] = stack[-1] // right
+            elif op == STORE_GLOBAL:
+                variables[names[arg]] = pop()
+            elif op == DUP:
+                push(stack[-1])
+            elif op == POP:
+                pop()
+            elif op == LET_RESULT:
+                push(f"Variable '{names[arg]}' = {pop()}")
+            elif op == DEFINE_FUNCTION:
+                function = consts[arg]
+                self.define_function(function)
+                push(f"Function '{function.name}' defined")
+            else:
+                raise Exception(f"Unknown opcode: {op}")
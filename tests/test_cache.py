@@ -0,0 +1,99 @@
+import sys
+import io
+import os
+import pickle
+
+import pytest
+
+sys.path.insert(0, '..')
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from src.cache import ProgramCache, ParseCache, CacheUnpickler, HEADER
+from src.main import main, run_file, compile_statements
+from src.optimizer import Optimizer
+from src.interpreter import Interpreter
+
+PROGRAM = """let base = 5
+func add(a, b) = a + b
+#add(base, 2)
+1 + $
+"""
+
+EXPECTED = [
+    "Line 1: Variable 'base' = 5",
+    "Line 2: Function 'add' defined",
+    "Line 3: 7",
+    "Error in line 4 '1 + $': Invalid character \"$\" at position 54",
+]
+
+
+def test_run_file_reuses_cached_program(tmp_path, capsys):
+    script = tmp_path / "program.nit"
+    script.write_text(PROGRAM, encoding='utf-8')
+    cache = ProgramCache()
+    for _ in range(2):
+        run_file(str(script), cache=cache)
+        assert capsys.readouterr().out.splitlines() == EXPECTED
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert (tmp_path / "program.nitc").exists()
+
+    script.write_text(PROGRAM.replace("base, 2", "base, 3"), encoding='utf-8')
+    run_file(str(script), cache=cache)
+    assert capsys.readouterr().out.splitlines()[2] == "Line 3: 8"
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_stale_and_corrupt_entries_are_ignored(tmp_path):
+    script = str(tmp_path / "program.nit")
+    cache = ProgramCache(str(tmp_path / "cache"))
+    program = list(compile_statements(PROGRAM))
+    assert cache.store(script, PROGRAM, program)
+    assert [line for line, _ in cache.load(script, PROGRAM)] == [1, 2, 3, 4]
+    assert cache.load(script, PROGRAM, optimize=True) is None
+
+    path = cache.path_for(script)
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+    with open(path, 'wb') as f:
+        f.write(header + b'garbage')
+    assert cache.load(script, PROGRAM) is None
+
+    with open(path, 'wb') as f:
+        f.write(header + pickle.dumps(os.system))
+    assert cache.load(script, PROGRAM) is None
+
+    for name in (b'__builtins__', b'__loader__', b'ASTNode.__init__'):
+        with open(path, 'wb') as f:
+            f.write(header + b'cast_nodes\n' + name + b'\n.')
+        assert cache.load(script, PROGRAM) is None
+    with pytest.raises(pickle.UnpicklingError, match="not allowed"):
+        CacheUnpickler(io.BytesIO(b'cast_nodes\n__builtins__\n.')).load()
+
+
+def test_parse_cache_is_lru_bounded():
+    cache = ParseCache(maxsize=2, optimizer=Optimizer())
+    first = cache.parse("1 + 2 * x")
+    assert cache.parse("1 + 2 * x") is first
+    assert repr(cache.parse("2 * 3")) == "Number(6)"
+    cache.parse("1 + 2 * x")
+    cache.parse("let y = 1")
+    assert list(cache.entries) == ["1 + 2 * x", "let y = 1"]
+    assert cache.stats() == {'hits': 2, 'misses': 3, 'size': 2, 'maxsize': 2}
+
+    interpreter = Interpreter()
+    interpreter.interpret(cache.parse("let x = 4"))
+    assert [interpreter.interpret(cache.parse("1 + 2 * x")) for _ in range(2)] == [9, 9]
+    try:
+        cache.parse("1 +")
+    except Exception:
+        pass
+    assert "1 +" not in cache.entries
+
+
+def test_repl_reports_parse_cache_stats(monkeypatch, capsys):
+    inputs = iter(["let a = 2", "a * 3", "a * 3", "debug", "exit"])
+    monkeypatch.setattr('builtins.input', lambda prompt: next(inputs))
+    main()
+    output = capsys.readouterr().out
+    assert output.count("=> 6") == 2
+    assert "Parse cache: 1 hits, 2 misses, 2/256 entries" in output
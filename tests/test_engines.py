@@ -0,0 +1,96 @@
+import sys
+import os
+
+sys.path.insert(0, '..')
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.interpreter import Interpreter
+from src.vm import VM
+from src.closure_compiler import ClosureInterpreter
+from src.stack_interpreter import StackInterpreter
+
+ENGINES = [VM, ClosureInterpreter, StackInterpreter]
+
+
+PROGRAM = [
+    ("2 + 3 * 4", 14),
+    ("((2 + 3) * 4) / 2", 10),
+    ("5 - 10", -5),
+    ("let base = 5", "Variable 'base' = 5"),
+    ("base * 2", 10),
+    ("func fact(n) = if n == 0 then 1 else n * #fact(n - 1)", "Function 'fact' defined"),
+    ("#fact(5)", 120),
+    ("func compute(n) = let doubled = n * 2 in doubled + base", None),
+    ("#compute(10)", 25),
+    ("let x = 10 in let y = 20 in x + y + base", 35),
+    ("func sum(n) = if n == 0 then 0 else let m = n - 1 in n + #sum(m)", None),
+    ("#fact(#sum(3))", 720),
+    ("(let x = 5 in x * 2) + 10", 20),
+    ("let z = 100 in let z = 200 in z", 200),
+    ("func complex(base) = let base = base * 2 in base + 1", None),
+    ("#complex(5)", 11),
+    ("base", 5),
+    ("func fib(n) = if n == 0 then 0 else if n == 1 then 1 else #fib(n - 1) + #fib(n - 2)", None),
+    ("#fib(7)", 13),
+    ("func add(a, b) = { let s = a + b s }", None),
+    ("#add(5, 3)", 8),
+    ("func bump(a) = { let a = a + 1 a }", None),
+    ("#bump(1)", 2),
+    ("#add(#add(1, 2), #add(3, 4))", 10),
+]
+
+
+def run(engine, code):
+    return engine.interpret(Parser(Lexer(code).tokenize()).parse())
+
+
+def error_of(engine, code):
+    try:
+        run(engine, code)
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def test_engines_match_tree_walker():
+    for engine_class in ENGINES:
+        tree_walker = Interpreter()
+        engine = engine_class()
+        for code, expected in PROGRAM:
+            tree_result = run(tree_walker, code)
+            engine_result = run(engine, code)
+            assert engine_result == tree_result, (engine_class.__name__, code)
+            if expected is not None:
+                assert engine_result == expected, (engine_class.__name__, code)
+
+
+def test_engine_errors_match_tree_walker():
+    for engine_class in ENGINES:
+        tree_walker = Interpreter()
+        engine = engine_class()
+        setup = "func two(a, b) = a + b"
+        run(tree_walker, setup)
+        run(engine, setup)
+        for code in ["10 / 0", "missing + 1", "#nothing(1)", "#two(1)"]:
+            assert error_of(engine, code) == error_of(tree_walker, code), (engine_class.__name__, code)
+
+
+def test_vm_deep_recursion():
+    vm = VM()
+    run(vm, "func sum(n) = if n == 0 then 0 else n + #sum(n - 1)")
+    assert run(vm, "#sum(20000)") == 20000 * 20001 // 2
+    run(vm, "func loop(n, acc) = if n == 0 then acc else #loop(n - 1, acc + n)")
+    assert run(vm, "#loop(100000, 0)") == 100000 * 100001 // 2
+
+
+def test_stack_interpreter_deep_recursion():
+    engine = StackInterpreter()
+    run(engine, "func sum(n) = if n == 0 then 0 else n + #sum(n - 1)")
+    assert run(engine, "#sum(1000000)") == 1000000 * 1000001 // 2
+    run(engine, "func steps(n) = { let m = n - 1\n if n == 0 then 0 else 1 + #steps(m) }")
+    assert run(engine, "#steps(50000)") == 50000
+    run(engine, "func loop(n, acc) = if n == 0 then acc else #loop(n - 1, acc + n)")
+    assert run(engine, "#loop(100000, 0)") == 100000 * 100001 // 2
+    assert run(engine, "#sum(3)") == 6
@@ -0,0 +1,191 @@
+import sys
+import os
+
+sys.path.insert(0, '..')
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.interpreter import Interpreter
+
+
+def run(interpreter, code):
+    return interpreter.interpret(Parser(Lexer(code).tokenize()).parse())
+
+
+def test_tail_recursion_runs_in_constant_stack():
+    interpreter = Interpreter()
+    run(interpreter, "func loop(n, acc) = if n == 0 then acc else #loop(n - 1, acc + n)")
+    assert run(interpreter, "#loop(100000, 0)") == 100000 * 100001 // 2
+
+
+def test_tail_calls_through_let_and_block_bodies():
+    interpreter = Interpreter()
+    run(interpreter, "func down(n) = if n == 0 then 0 else let m = n - 1 in #down(m)")
+    assert run(interpreter, "#down(50000)") == 0
+    run(interpreter, "func even(n) = { if n == 0 then 1 else #odd(n - 1) }")
+    run(interpreter, "func odd(n) = { if n == 0 then 0 else #even(n - 1) }")
+    assert run(interpreter, "#even(50001)") == 0
+
+
+def test_tail_call_restores_caller_scope():
+    interpreter = Interpreter()
+    run(interpreter, "func id(n) = n")
+    run(interpreter, "func wrap(n) = let k = n * 2 in #id(k)")
+    assert run(interpreter, "let k = 7 in #wrap(1) + k") == 9
+
+
+def test_memoized_fib_is_fast_and_counts_hits():
+    interpreter = Interpreter(memoize=True, memo_maxsize=64)
+    run(interpreter, "func fib(n) = if n == 0 then 0 else if n == 1 then 1 else #fib(n - 1) + #fib(n - 2)")
+    assert run(interpreter, "#fib(60)") == 1548008755920
+    stats = interpreter.memo.stats()['fib']
+    assert stats['misses'] == 61
+    assert stats['hits'] > 0
+    assert stats['size'] <= 64
+
+
+def test_memo_invalidated_on_redefinition():
+    interpreter = Interpreter(memoize=True)
+    run(interpreter, "let base = 10")
+    run(interpreter, "func offset(n) = n + base")
+    run(interpreter, "func twice(n) = #offset(n) * 2")
+    assert run(interpreter, "#twice(1)") == 22
+    run(interpreter, "let base = 20")
+    assert run(interpreter, "#twice(1)") == 42
+    run(interpreter, "func offset(n) = n - base")
+    assert run(interpreter, "#twice(1)") == -38
+
+
+def test_memo_skips_impure_and_unlisted_functions():
+    interpreter = Interpreter(memoize=['square'])
+    run(interpreter, "func square(n) = n * n")
+    run(interpreter, "func cube(n) = n * n * n")
+    run(interpreter, "func setup(n) = { func helper(x) = x + n n }")
+    run(interpreter, "#square(3)")
+    run(interpreter, "#cube(3)")
+    run(interpreter, "#setup(3)")
+    assert set(interpreter.memo.stats()) == {'square'}
+
+
+def test_resolver_assigns_frame_slots():
+    interpreter = Interpreter()
+    run(interpreter, "let z = 1")
+    run(interpreter, "func f(a) = { let b = a + z let a = b * 2 let z = a + 1 z }")
+    assert run(interpreter, "#f(3)") == 9
+    assert interpreter.global_env.get_function('f').frame_size == 3
+    assert run(interpreter, "let a = 1 in let b = 2 in let a = a + b in a * b") == 6
+    assert run(interpreter, "z") == 1
+
+
+def test_undefined_variable_reported_when_evaluated():
+    interpreter = Interpreter()
+    assert run(interpreter, "if 0 then zz else 1") == 1
+    assert run(interpreter, "let a = 1 in if a == 1 then 2 else qq") == 2
+    try:
+        run(interpreter, "if 1 == 1 then missing else 5")
+    except Exception as e:
+        assert str(e) == "Undefined variable: missing"
+    else:
+        assert False, "expected an undefined variable error"
+    run(interpreter, "func later() = defined_later + 1")
+    run(interpreter, "let defined_later = 41")
+    assert run(interpreter, "#later()") == 42
+
+
+def test_inlining_small_functions():
+    interpreter = Interpreter(inline=True)
+    run(interpreter, "func double(x) = x * 2")
+    run(interpreter, "func quad(x) = #double(#double(x))")
+    assert repr(interpreter.global_env.get_function('quad').body) == (
+        "LetExpression(let x$2 = LetExpression(let x$1 = Identifier(x) in "
+        "BinaryOp(Identifier(x$1) MULTIPLY Number(2))) in "
+        "BinaryOp(Identifier(x$2) MULTIPLY Number(2)))"
+    )
+    assert run(interpreter, "#quad(5)") == 20
+    run(interpreter, "func fact(n) = if n == 0 then 1 else n * #fact(n - 1)")
+    assert 'fact' in repr(interpreter.global_env.get_function('fact').body)
+
+
+def test_inlining_avoids_capture_and_respects_redefinition():
+    interpreter = Interpreter(inline=True)
+    run(interpreter, "let a = 100")
+    run(interpreter, "func plus_a(x) = x + a")
+    run(interpreter, "func shadowed(a) = #plus_a(a)")
+    assert repr(interpreter.global_env.get_function('shadowed').body) == (
+        "FunctionCall(plus_a(Identifier(a)))"
+    )
+    assert run(interpreter, "#shadowed(1)") == 101
+    run(interpreter, "func inc(x) = x + 1")
+    run(interpreter, "func twice(x) = #inc(#inc(x))")
+    run(interpreter, "func outer(x) = #twice(x) * 10")
+    assert run(interpreter, "#outer(1)") == 30
+    run(interpreter, "func inc(x) = x + 5")
+    assert run(interpreter, "#outer(1)") == 110
+    assert run(interpreter, "let x = 1 in #twice(x)") == 11
+
+
+def test_dispatch_table_honours_subclass_overrides():
+    class DoublingInterpreter(Interpreter):
+        def visit_Number(self, node):
+            return node.value * 2
+
+    assert run(DoublingInterpreter(), "1 + 2") == 6
+    assert run(Interpreter(), "1 + 2") == 3
+
+    class Counting(Interpreter):
+        def __init__(self):
+            super().__init__()
+            self.counts = {'if': 0, 'call': 0}
+
+        def visit_IfExpr(self, node):
+            self.counts['if'] += 1
+            return super().visit_IfExpr(node)
+
+        def visit_FunctionCall(self, node):
+            self.counts['call'] += 1
+            return super().visit_FunctionCall(node)
+
+    counting = Counting()
+    run(counting, "func f(n) = if n == 0 then 0 else #f(n - 1)")
+    assert run(counting, "#f(5)") == 0
+    assert counting.counts == {'if': 6, 'call': 6}
+    doubling = DoublingInterpreter()
+    run(doubling, "func g(n) = if n == 0 then 7 else #g(n - 1)")
+    assert run(doubling, "#g(5000)") == 14
+
+    class Unknown:
+        pass
+
+    try:
+        Interpreter().visit(Unknown())
+    except Exception as e:
+        assert str(e) == "No visit_Unknown method"
+    else:
+        assert False, "expected generic_visit to raise"
+
+
+def test_call_batch_over_lists_and_arrays():
+    interpreter = Interpreter()
+    run(interpreter, "let offset = 10")
+    run(interpreter, "func score(a, b) = if a == b then 0 else a * b + offset")
+    run(interpreter, "func loop(n, acc) = if n == 0 then acc else #loop(n - 1, acc + 1)")
+    assert interpreter.call_batch("score", [[1, 2, 3], [1, 5, 3]]) == [0, 20, 0]
+    assert interpreter.call_batch("loop", [[5000, 3], [0, 1]]) == [5000, 4]
+    assert interpreter.call_batch("score", [[], []]) == []
+    for columns, message in (([[1]], "expects 2 arguments, got 1"),
+                             ([[1, 2], [1]], "different lengths")):
+        try:
+            interpreter.call_batch("score", columns)
+        except Exception as e:
+            assert message in str(e)
+        else:
+            assert False
+    try:
+        import numpy as np
+    except ImportError:
+        return
+    result = interpreter.call_batch("score", [np.array([2, 4]), [3, 4]])
+    assert isinstance(result, np.ndarray) and result.tolist() == [16, 0]
+    big = interpreter.call_batch("score", [np.array([2**40]), np.array([2**40 + 1])])
+    assert big.dtype == object and big[0] == 2**40 * (2**40 + 1) + 10
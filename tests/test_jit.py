@@ -0,0 +1,96 @@
+import io
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, '..')
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.interpreter import Interpreter
+
+PROGRAM = [
+    "func fib(n) = if n == 0 then 0 else if n == 1 then 1 else #fib(n - 1) + #fib(n - 2)",
+    "func down(n) = if n == 0 then 0 else #down(n - 1)",
+    "func loop(n, acc) = if n == 0 then acc else #loop(n - 1, acc + n)",
+    "func scale(n) = let a = n * 3 in let b = a / 2 in b + offset",
+    "func ratio(n) = 100 / n",
+    "func even(n) = if n == 0 then 1 else #odd(n - 1)",
+    "func odd(n) = if n == 0 then 0 else #even(n - 1)",
+    "let offset = 7",
+]
+CASES = ["#fib(15)", "#down(5000)", "#loop(100000, 0)", "#scale(11)", "#even(5001)", "#odd(5001)"]
+
+
+def run(interpreter, code):
+    return interpreter.interpret(Parser(Lexer(code).tokenize()).parse())
+
+
+def jit_interpreter(**options):
+    interpreter = Interpreter(jit=True, jit_threshold=3, **options)
+    for line in PROGRAM:
+        run(interpreter, line)
+    return interpreter
+
+
+def test_compiled_functions_match_the_interpreter():
+    interpreter = Interpreter()
+    for line in PROGRAM:
+        run(interpreter, line)
+    expected = [run(interpreter, code) for code in CASES]
+    jitted = jit_interpreter()
+    assert [run(jitted, code) for code in CASES] == expected
+    assert set(jitted.jit.compiled) == {'fib', 'down', 'loop', 'even', 'odd'}
+    # Tail calls to other functions still go through the trampoline.
+    assert "_tail(_function('odd')" in jitted.jit.sources['even']
+    assert "continue" in jitted.jit.sources['loop']
+
+
+def test_compiled_code_reads_current_globals_and_raises_interpreter_errors():
+    interpreter = jit_interpreter()
+    for n in range(5):
+        assert run(interpreter, f"#scale({n})") == n * 3 // 2 + 7
+        assert run(interpreter, f"#ratio({n + 1})") == 100 // (n + 1)
+    assert 'scale' in interpreter.jit.sources
+    run(interpreter, "let offset = 1")
+    assert run(interpreter, "#scale(4)") == 7
+    with pytest.raises(Exception, match="Division by zero"):
+        run(interpreter, "#ratio(0)")
+    run(interpreter, "func lost(n) = n + missing")
+    for _ in range(3):
+        with pytest.raises(Exception, match="Undefined variable: missing"):
+            run(interpreter, "#lost(1)")
+
+
+def test_redefinition_drops_compiled_code():
+    interpreter = jit_interpreter()
+    for _ in range(3):
+        run(interpreter, "#fib(5)")
+    assert 'fib' in interpreter.jit.compiled
+    run(interpreter, "func fib(n) = n * 10")
+    assert 'fib' not in interpreter.jit.compiled
+    assert run(interpreter, "#fib(5)") == 50
+
+
+def test_functions_that_define_functions_stay_interpreted():
+    interpreter = jit_interpreter()
+    run(interpreter, "func make(n) = { func inner(x) = x * 2 #inner(n) }")
+    for n in range(5):
+        assert run(interpreter, f"#make({n})") == 2 * n
+    assert interpreter.jit.compiled['make'][1] is None
+
+
+def test_dump_writes_generated_source():
+    stream = io.StringIO()
+    interpreter = Interpreter(jit=True, jit_threshold=2, jit_dump=True)
+    interpreter.jit.stream = stream
+    run(interpreter, PROGRAM[2])
+    run(interpreter, "#loop(10, 0)")
+    assert stream.getvalue().startswith("# jit: loop\ndef nit_loop(s0, s1):")
+
+
+def test_jit_rejects_per_call_hooks():
+    with pytest.raises(Exception, match="cannot be combined"):
+        Interpreter(jit=True, profile=True)
@@ -0,0 +1,80 @@
+import sys
+import os
+
+sys.path.insert(0, '..')
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from src.lexer import Lexer
+from token_types import TokenType
+
+
+def kinds(code):
+    return [(token.type, token.value, token.position) for token in Lexer(code).tokenize()]
+
+
+def test_token_stream():
+    assert kinds("func f(a,b)={a==b}") == [
+        (TokenType.FUNC, 'func', 0),
+        (TokenType.IDENTIFIER, 'f', 5),
+        (TokenType.LPAREN, '(', 6),
+        (TokenType.IDENTIFIER, 'a', 7),
+        (TokenType.COMMA, ',', 8),
+        (TokenType.IDENTIFIER, 'b', 9),
+        (TokenType.RPAREN, ')', 10),
+        (TokenType.ASSIGN, '=', 11),
+        (TokenType.LBRACE, '{', 12),
+        (TokenType.IDENTIFIER, 'a', 13),
+        (TokenType.EQUALS, '==', 14),
+        (TokenType.IDENTIFIER, 'b', 16),
+        (TokenType.RBRACE, '}', 17),
+        (TokenType.EOF, None, 18),
+    ]
+    assert kinds("  12abc #g(let_x)") == [
+        (TokenType.NUMBER, 12, 2),
+        (TokenType.IDENTIFIER, 'abc', 4),
+        (TokenType.HASH, '#', 8),
+        (TokenType.IDENTIFIER, 'g', 9),
+        (TokenType.LPAREN, '(', 10),
+        (TokenType.IDENTIFIER, 'let_x', 11),
+        (TokenType.RPAREN, ')', 16),
+        (TokenType.EOF, None, 17),
+    ]
+
+
+def test_get_next_token_matches_tokenize():
+    code = "let x = 10 in x * (2 - 1) / 3"
+    lexer = Lexer(code)
+    tokens = []
+    while True:
+        token = lexer.get_next_token()
+        tokens.append((token.type, token.value, token.position))
+        if token.type == TokenType.EOF:
+            break
+    assert tokens == kinds(code)
+
+
+def test_invalid_character_position():
+    for method in ('tokenize', 'get_next_token'):
+        lexer = Lexer("1 + 2 $ 3") if method == 'tokenize' else Lexer("$")
+        try:
+            while True:
+                result = getattr(lexer, method)()
+                if method == 'tokenize' or result.type == TokenType.EOF:
+                    break
+        except Exception as e:
+            position = 6 if method == 'tokenize' else 0
+            assert str(e) == f'Invalid character "$" at position {position}'
+        else:
+            assert False, "expected an invalid character error"
+
+
+def test_parser_consumes_token_stream_lazily():
+    from src.parser import Parser
+
+    code = "func f(n) = if n == 0 then 1 else n * #f(n - 1)"
+    assert repr(Parser(Lexer(code).tokens()).parse()) == repr(Parser(Lexer(code).tokenize()).parse())
+
+    lexer = Lexer("1 + 2 $ 3")
+    parser = Parser(lexer.tokens())
+    assert parser.current_token.value == 1
+    assert lexer.pos == 1
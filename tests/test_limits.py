@@ -0,0 +1,77 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, '..')
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.interpreter import Interpreter, Limits, LimitExceeded
+
+LOOP = "func loop(n) = if n == 0 then 0 else #loop(n - 1)"
+SUM = "func sum(n) = if n == 0 then 0 else n + #sum(n - 1)"
+FIB = "func fib(n) = if n == 0 then 0 else if n == 1 then 1 else #fib(n - 1) + #fib(n - 2)"
+
+
+def run(interpreter, code):
+    return interpreter.interpret(Parser(Lexer(code).tokenize()).parse())
+
+
+class FakeClock:
+    """Advances by ``tick`` seconds every time it is read."""
+
+    def __init__(self, tick):
+        self.tick = tick
+        self.now = 0.0
+        self.reads = 0
+
+    def __call__(self):
+        self.reads += 1
+        self.now += self.tick
+        return self.now
+
+
+def test_step_limit_is_per_evaluation():
+    interpreter = Interpreter(max_steps=100)
+    run(interpreter, LOOP)
+    assert run(interpreter, "#loop(99)") == 0
+    with pytest.raises(LimitExceeded, match="Step limit of 100 exceeded"):
+        run(interpreter, "#loop(100)")
+    assert run(interpreter, "#loop(50) + #loop(48)") == 0
+    with pytest.raises(LimitExceeded):
+        interpreter.call_batch("loop", [[60, 60]])
+    assert interpreter.call_batch("loop", [[40, 40]]) == [0, 0]
+
+
+def test_depth_limit_counts_nested_calls_only():
+    interpreter = Interpreter(max_depth=50)
+    run(interpreter, LOOP)
+    run(interpreter, SUM)
+    assert run(interpreter, "#sum(49)") == 1225
+    with pytest.raises(LimitExceeded, match="Call depth limit of 50 exceeded in 'sum'"):
+        run(interpreter, "#sum(50)")
+    assert run(interpreter, "#loop(10000)") == 0
+    assert run(interpreter, "#sum(10)") == 55
+
+
+def test_deadline_reads_clock_in_batches():
+    clock = FakeClock(0.01)
+    interpreter = Interpreter()
+    Limits(time_limit=1.0, check_every=100, clock=clock).install(interpreter)
+    run(interpreter, FIB)
+    clock.reads = 0
+    assert run(interpreter, "#fib(15)") == 610
+    assert clock.reads == 1 + 1973 // 100
+    with pytest.raises(LimitExceeded, match=r"Time limit of 1.0s exceeded"):
+        run(interpreter, "#fib(20)")
+    assert run(interpreter, "#fib(15)") == 610
+
+
+def test_time_limit_stops_exponential_recursion():
+    interpreter = Interpreter(time_limit=0.05, max_depth=100)
+    run(interpreter, FIB)
+    with pytest.raises(Exception, match="Time limit"):
+        run(interpreter, "#fib(40)")
+    assert run(interpreter, "#fib(10)") == 55
@@ -0,0 +1,71 @@
+import sys
+import os
+
+sys.path.insert(0, '..')
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from src.main import run_file
+
+PROGRAM = """# sample program
+let base = 5
+func fact(n) =
+    if n == 0 then 1
+    else n * #fact(n - 1)
+#fact(5)
+missing + 1
+#fact(3) + base
+"""
+
+EXPECTED = [
+    "Line 2: Variable 'base' = 5",
+    "Line 3: Function 'fact' defined",
+    "Line 6: 120",
+    "Error in line 7 'missing + 1': Undefined variable: missing",
+    "Line 8: 11",
+]
+
+
+def test_run_file(tmp_path, capsys):
+    script = tmp_path / "program.nit"
+    script.write_text(PROGRAM, encoding='utf-8')
+    for engine in ('tree', 'vm', 'closure', 'stack'):
+        for optimize in (False, True):
+            run_file(str(script), engine=engine, optimize=optimize)
+            assert capsys.readouterr().out.splitlines() == EXPECTED, (engine, optimize)
+
+
+PARALLEL_PROGRAM = """func fib(n) = if n == 0 then 0 else if n == 1 then 1 else #fib(n - 1) + #fib(n - 2)
+let a = #fib(12)
+let b = #fib(13)
+a + b
+let a = #missing(1)
+a + 1
+func mk(x) = {
+    func made(y) = y * 2
+    #made(x)
+}
+#made(1)
+#mk(5)
+#made(3)
+1 / 0
+"""
+
+
+def test_run_file_parallel_matches_sequential(tmp_path, capsys):
+    script = tmp_path / "parallel.nit"
+    script.write_text(PARALLEL_PROGRAM, encoding='utf-8')
+    for engine in ('tree', 'vm', 'closure', 'stack'):
+        run_file(str(script), engine=engine)
+        sequential = capsys.readouterr().out
+        run_file(str(script), engine=engine, jobs=2)
+        assert capsys.readouterr().out == sequential, engine
+    assert sequential.splitlines()[:6] == [
+        "Line 1: Function 'fib' defined",
+        "Line 2: Variable 'a' = 144",
+        "Line 3: Variable 'b' = 233",
+        "Line 4: 377",
+        "Error in line 5 'let a = #missing(1)': Undefined function: missing",
+        "Line 6: 145",
+    ]
+    assert sequential.splitlines()[-3:] == [
+        "Line 12: 10", "Line 13: 6", "Error in line 14 '1 / 0': Division by zero"]
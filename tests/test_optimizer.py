@@ -0,0 +1,44 @@
+import sys
+import os
+
+sys.path.insert(0, '..')
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.interpreter import Interpreter
+from src.optimizer import Optimizer
+
+
+def optimized(code):
+    return Optimizer().optimize(Parser(Lexer(code).tokens()).parse())
+
+
+def test_constant_folding_and_propagation():
+    assert repr(optimized("2 + 3 * 4")) == "Number(14)"
+    assert repr(optimized("let x = 10 in x * 2")) == "Number(20)"
+    assert repr(optimized("if 1 == 1 then a else b")) == "Identifier(a)"
+    assert repr(optimized("if 2 == 3 then a else b")) == "Identifier(b)"
+    assert repr(optimized("let x = 2 in let x = y in x + 1")) == (
+        "LetExpression(let x = Identifier(y) in BinaryOp(Identifier(x) PLUS Number(1)))"
+    )
+
+
+def test_algebraic_identities():
+    assert repr(optimized("x * 1 + 0")) == "Identifier(x)"
+    assert repr(optimized("1 * (0 + x) / 1 - 0")) == "Identifier(x)"
+    assert repr(optimized("func f(n) = n * (3 - 2) + #g(n + 0)")) == (
+        "FunctionDef(f(n) = BinaryOp(Identifier(n) PLUS FunctionCall(g(Identifier(n)))))"
+    )
+
+
+def test_division_by_zero_is_kept():
+    tree = optimized("1 + 10 / (5 - 5)")
+    assert repr(tree) == "BinaryOp(Number(1) PLUS BinaryOp(Number(10) DIVIDE Number(0)))"
+    try:
+        Interpreter().interpret(tree)
+    except Exception as e:
+        assert str(e) == "Division by zero"
+    else:
+        assert False, "expected a division by zero error"
+    assert repr(optimized("if 0 == 0 then 1 else 1 / 0")) == "Number(1)"
@@ -0,0 +1,99 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, '..')
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.interpreter import Interpreter
+
+
+def parse(code):
+    return Parser(Lexer(code).tokens()).parse()
+
+
+def error_of(code):
+    try:
+        parse(code)
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def test_precedence_and_associativity():
+    assert repr(parse("10 - 2 - 3 * 4 / 2")) == (
+        "BinaryOp(BinaryOp(Number(10) MINUS Number(2)) MINUS "
+        "BinaryOp(BinaryOp(Number(3) MULTIPLY Number(4)) DIVIDE Number(2)))"
+    )
+    assert repr(parse("(a == b) == c")) == (
+        "Comparison(Comparison(Identifier(a) EQUALS Identifier(b)) EQUALS Identifier(c))"
+    )
+    assert repr(parse("1 + (if x then 1 else 2)")) == (
+        "BinaryOp(Number(1) PLUS IfExpr(if Identifier(x) then Number(1) else Number(2)))"
+    )
+
+
+def test_comparison_does_not_chain():
+    assert error_of("a == b == c").startswith("Expected end of input")
+    assert error_of("(a == b == c)").startswith("Expected TokenType.RPAREN, got TokenType.EQUALS")
+    assert error_of("((1 + 2) * 3").startswith("Expected TokenType.RPAREN, got TokenType.EOF")
+    assert error_of("1 + if x then 1 else 2").startswith("Expected number, identifier, or expression")
+
+
+def test_deep_and_long_expressions():
+    depth = 20000
+    assert repr(parse("(" * depth + "7" + ")" * depth)) == "Number(7)"
+    node = parse(" + ".join(["1"] * depth))
+    length = 1
+    while type(node).__name__ == 'BinaryOp':
+        node = node.left
+        length += 1
+    assert length == depth
+    assert Interpreter().interpret(parse("((2 + 3) * (4 - 1)) / (1 + (2))")) == 5
+
+
+def test_parse_program_with_multiline_statements():
+    source = (
+        "# setup\n"
+        "let base = 5\n"
+        "func add(a, b) = {\n"
+        "    let s = a + b\n"
+        "    s\n"
+        "}\n"
+        "#add(base,\n"
+        "     1)  # trailing comment\n"
+    )
+    program = Parser.from_source(source).parse_program()
+    assert [line for line, _ in program] == [2, 3, 7]
+    interpreter = Interpreter()
+    assert [interpreter.interpret(node) for _, node in program][-1] == 6
+
+
+def test_statements_recover_from_errors():
+    source = "1 + $\nlet x = 1 x\n2 * 3\n"
+    results = list(Parser.from_source(source).statements(recover=True))
+    assert [line for line, _ in results] == [1, 2, 3]
+    assert str(results[0][1]).startswith('Invalid character "$"')
+    assert str(results[1][1]).startswith("Expected end of line")
+    assert repr(results[2][1]) == "BinaryOp(Number(2) MULTIPLY Number(3))"
+
+
+def test_line_break_after_operator_ends_statement():
+    results = list(Parser.from_source("func f(a) = a *\n#f(3)\n").statements(recover=True))
+    assert [line for line, _ in results] == [1, 2]
+    assert str(results[0][1]).startswith("Expected number, identifier, or expression")
+    assert repr(results[1][1]) == "FunctionCall(f(Number(3)))"
+    with pytest.raises(Exception, match="Expected number"):
+        Parser.from_source("func f(a) = a *\n#f(3)\n").parse_program()
+
+
+def test_statements_recover_at_line_of_failing_token():
+    for source in ("let x = 1 +\nlet y = 2\ny\n", "let x = (1 +\nlet y = 2\ny\n"):
+        results = list(Parser.from_source(source).statements(recover=True))
+        assert [line for line, _ in results] == [1, 2, 3]
+        assert isinstance(results[0][1], Exception)
+        assert repr(results[1][1]) == "LetStatement(y = Number(2))"
+        assert repr(results[2][1]) == "Identifier(y)"
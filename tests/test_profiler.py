@@ -0,0 +1,86 @@
+import sys
+import os
+import json
+import pstats
+
+sys.path.insert(0, '..')
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.interpreter import Interpreter
+from src.profiler import Profiler
+from src.main import run_file
+
+
+def run(interpreter, code):
+    return interpreter.interpret(Parser(Lexer(code).tokenize()).parse())
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+def test_profiler_counts_calls_depth_and_time():
+    interpreter = Interpreter()
+    profiler = Profiler(clock=FakeClock()).install(interpreter)
+    run(interpreter, "func fib(n) = if n == 0 then 0 else if n == 1 then 1 else #fib(n - 1) + #fib(n - 2)")
+    run(interpreter, "func loop(n, acc) = if n == 0 then acc else #loop(n - 1, acc + #fib(3))")
+    assert run(interpreter, "#loop(10, 0)") == 20
+
+    rows = {row['function']: row for row in profiler.results()}
+    assert rows['fib']['calls'] == 50 and rows['fib']['max_depth'] == 3
+    assert rows['loop']['calls'] == 11 and rows['loop']['max_depth'] == 1
+    for row in rows.values():
+        assert 0 < row['exclusive'] <= row['inclusive']
+    assert profiler.stack == []
+    assert profiler.format_table(sort='calls').splitlines()[1].startswith('fib')
+
+    data = profiler.pstats_data()
+    primitive, calls, exclusive, inclusive, callers = data[('<nitlang>', 0, 'fib')]
+    assert (primitive, calls) == (10, 50)
+    assert callers[('<nitlang>', 0, 'loop')][:2] == (10, 10)
+
+
+def test_profiler_is_per_instance_and_survives_errors():
+    plain = Interpreter()
+    profiled = Interpreter(profile=True)
+    assert 'run_body' not in vars(plain) and plain.profiler is None
+    run(profiled, "func f(x) = 10 / x")
+    for value in (1, 0):
+        try:
+            run(profiled, f"#f({value})")
+        except Exception as e:
+            assert str(e) == "Division by zero"
+    assert profiled.profiler.stack == []
+    assert profiled.profiler.results()[0]['calls'] == 2
+    profiled.profiler.uninstall(profiled)
+    assert 'run_body' not in vars(profiled)
+
+
+def test_run_file_profile_outputs(tmp_path, capsys):
+    script = tmp_path / "program.nit"
+    script.write_text("func sq(x) = x * x\n#sq(3) + #sq(4)\n", encoding='utf-8')
+    run_file(str(script), profile=True, profile_output=str(tmp_path / "profile.json"))
+    output = capsys.readouterr().out.splitlines()
+    assert output[:2] == ["Line 1: Function 'sq' defined", "Line 2: 25"]
+    assert output[4].split()[:2] == ['sq', '2']
+    with open(tmp_path / "profile.json", encoding='utf-8') as f:
+        assert json.load(f)['functions'][0]['calls'] == 2
+
+    run_file(str(script), profile=True, profile_output=str(tmp_path / "profile.prof"))
+    capsys.readouterr()
+    stats = pstats.Stats(str(tmp_path / "profile.prof"))
+    assert stats.total_calls == 2
+
+
+def test_profiler_sees_batch_calls():
+    interpreter = Interpreter(profile=True)
+    run(interpreter, "func twice(x) = x * 2")
+    assert interpreter.call_batch("twice", [[1, 2, 3]]) == [2, 4, 6]
+    assert interpreter.profiler.results()[0]['calls'] == 3
@@ -0,0 +1,69 @@
+import sys
+import os
+
+sys.path.insert(0, '..')
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.interpreter import Interpreter
+
+
+def run(interpreter, code):
+    return interpreter.interpret(Parser(Lexer(code).tokenize()).parse())
+
+
+def reactive_interpreter(*lines):
+    interpreter = Interpreter(reactive=True)
+    for line in lines:
+        run(interpreter, line)
+    return interpreter
+
+
+def test_redefinition_recomputes_dependents_in_order():
+    interpreter = reactive_interpreter(
+        "let base = 5",
+        "func f(n) = n + base",
+        "let derived = 0",
+        "let total = #f(derived)",
+        "let derived = base * 2",
+        "let other = 3",
+    )
+    # derived was last defined after total, but is recomputed before it.
+    assert run(interpreter, "let base = 6") == (
+        "Variable 'base' = 6\n"
+        "Variable 'derived' = 12 (was 10)\n"
+        "Variable 'total' = 18 (was 15)"
+    )
+    assert interpreter.global_env.variables['other'] == 3
+
+
+def test_unchanged_values_stop_propagation():
+    interpreter = reactive_interpreter(
+        "let base = 5",
+        "let zero = base - base",
+        "let scaled = zero + 1",
+    )
+    assert run(interpreter, "let base = 9") == "Variable 'base' = 9"
+    assert interpreter.global_env.variables['scaled'] == 1
+
+
+def test_function_redefinition_updates_callers():
+    interpreter = reactive_interpreter("func f(n) = n + 1", "let y = #f(2)")
+    assert run(interpreter, "func f(n) = n * 10") == "Function 'f' defined\nVariable 'y' = 20 (was 3)"
+
+
+def test_failed_recomputation_keeps_old_values():
+    interpreter = reactive_interpreter("let base = 5", "let inv = 10 / base", "let w = inv + 1")
+    assert run(interpreter, "let base = 0") == (
+        "Variable 'base' = 0\n"
+        "Variable 'inv' not updated: Division by zero\n"
+        "Variable 'w' not updated: depends on 'inv'"
+    )
+    assert interpreter.global_env.variables['w'] == 3
+
+
+def test_self_updates_are_not_recorded():
+    interpreter = reactive_interpreter("let base = 1", "let x = base", "let x = x + base")
+    assert run(interpreter, "let base = 2") == "Variable 'base' = 2"
+    assert interpreter.global_env.variables['x'] == 2
@@ -0,0 +1,83 @@
+import sys
+import os
+import asyncio
+
+sys.path.insert(0, '..')
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from src.server import EvaluationServer
+
+
+async def request(reader, writer, text):
+    writer.write(text.encode('utf-8') + b'\n')
+    await writer.drain()
+    return (await reader.readline()).decode('utf-8').rstrip('\n')
+
+
+def test_sessions_are_isolated():
+    async def scenario():
+        server = EvaluationServer(workers=2)
+        await server.start()
+        host, port = server.address[:2]
+        first = await asyncio.open_connection(host, port)
+        second = await asyncio.open_connection(host, port)
+        try:
+            assert await request(*first, "let x = 2") == "OK Variable 'x' = 2"
+            assert await request(*first, "func sq(n) = n * n") == "OK Function 'sq' defined"
+            assert await request(*first, "#sq(x + 1)") == "OK 9"
+            assert await request(*second, "x") == "ERR Undefined variable: x"
+            assert (await request(*second, "1 +")).startswith("ERR Expected number")
+            await request(*second, "exit")
+            assert await second[0].readline() == b''
+        finally:
+            for _, writer in (first, second):
+                writer.close()
+            await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_slow_request_times_out_without_blocking_others():
+    async def scenario():
+        server = EvaluationServer(workers=2, timeout=0.5)
+        await server.start()
+        host, port = server.address[:2]
+        slow = await asyncio.open_connection(host, port)
+        fast = await asyncio.open_connection(host, port)
+        try:
+            await request(*slow, "func loop(n) = if n == 0 then 0 else #loop(n - 1)")
+            pending = asyncio.ensure_future(request(*slow, "#loop(100000000)"))
+            await asyncio.sleep(0.05)
+            assert await request(*fast, "6 * 7") == "OK 42"
+            assert await pending == "ERR Time limit of 0.5s exceeded"
+            assert await request(*slow, "#loop(3)") == "OK 0"
+        finally:
+            for _, writer in (slow, fast):
+                writer.close()
+            await server.close()
+        assert not server.sessions
+
+    asyncio.run(scenario())
+
+
+def test_sessions_without_limits_are_killed_after_timeout():
+    async def scenario():
+        server = EvaluationServer(engine='vm', workers=2, timeout=0.2)
+        await server.start()
+        host, port = server.address[:2]
+        slow = await asyncio.open_connection(host, port)
+        fast = await asyncio.open_connection(host, port)
+        try:
+            await request(*slow, "func loop(n) = if n == 0 then 0 else #loop(n - 1)")
+            assert await request(*slow, "#loop(100000000)") == "ERR Timeout after 0.2s"
+            assert await slow[0].readline() == b''
+            assert await request(*fast, "func loop(n) = n") == "OK Function 'loop' defined"
+            assert await request(*fast, "#loop(3)") == "OK 3"
+            assert len(server.sessions) == 1
+        finally:
+            for _, writer in (slow, fast):
+                writer.close()
+            await server.close()
+        assert not server.sessions
+
+    asyncio.run(scenario())
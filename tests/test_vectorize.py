@@ -0,0 +1,89 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, '..')
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+np = pytest.importorskip('numpy')
+
+from src.parser import Parser
+from src.interpreter import Interpreter
+
+PROGRAM = [
+    "let k = 7",
+    "func clamp(x) = if x == 0 then 1 else x",
+    "func score(a, b) = let s = a * k - b in if s == 0 then 0 else s / #clamp(b)",
+    "func ratio(a, b) = { let d = a - b\n a / d }",
+    "func safe(a, b) = if b == 0 then 0 - 1 else a / b",
+    "func square(a) = a * a",
+    "func fact(n) = if n == 0 then 1 else n * #fact(n - 1)",
+]
+
+
+def run(interpreter, code):
+    for _, node in Parser.from_source(code).parse_program():
+        interpreter.interpret(node)
+
+
+def interpreters():
+    vector, scalar = Interpreter(vectorize=True), Interpreter()
+    for line in PROGRAM:
+        for interpreter in (vector, scalar):
+            run(interpreter, line)
+    return vector, scalar
+
+
+def test_vectorized_results_match_scalar():
+    vector, scalar = interpreters()
+    a = np.arange(-50, 50)
+    b = (a * 37) % 11 - 5
+    for name in ("score", "safe"):
+        result = vector.call_batch(name, [a, b])
+        assert result.dtype == np.int64
+        assert result.tolist() == scalar.call_batch(name, [a.tolist(), b.tolist()])
+    for name in ("score", "safe", "square", "ratio", "fact"):
+        expected = vector.vectorizer.lookup(name) is not None
+        assert expected == (name not in ("fact",)), name
+
+
+def test_overflow_and_errors_fall_back_per_row():
+    vector, scalar = interpreters()
+    big = np.array([3, 2**40, -2**62, 5])
+    squares = vector.call_batch("square", [big])
+    assert squares.dtype == object
+    assert squares.tolist() == [9, 2**80, 2**124, 25]
+    assert vector.call_batch("ratio", [[4, 9], [2, 6]]) == [2, 3]
+    with pytest.raises(Exception, match="Division by zero"):
+        vector.call_batch("ratio", [[4, 9], [2, 9]])
+    assert vector.call_batch("fact", [[5, 3]]) == [120, 6]
+
+
+def test_vectorized_functions_follow_redefinition():
+    vector, _ = interpreters()
+    assert vector.call_batch("score", [[1], [3]]) == [1]
+    run(vector, "func clamp(x) = 2")
+    assert vector.call_batch("score", [[1], [3]]) == [2]
+    run(vector, "let k = 0 - 3")
+    assert vector.call_batch("score", [[1], [3]]) == [-3]
+    run(vector, "let k = 4294967296 * 4294967296")
+    assert vector.call_batch("score", [[1], [3]]) == [(2**64 - 3) // 2]
+
+
+def test_unused_let_values_still_raise():
+    vector, _ = interpreters()
+    run(vector, "func f(a, b) = let t = a / b in a + 1")
+    run(vector, "func g(a, b) = { let t = a / b\n a }")
+    for name in ("f", "g"):
+        assert vector.vectorizer.lookup(name) is not None
+        with pytest.raises(Exception, match="Division by zero"):
+            vector.call_batch(name, [np.array([1, 2]), np.array([1, 0])])
+
+
+def test_non_integer_columns_use_scalar_path():
+    vector, scalar = interpreters()
+    floats = np.array([2.5, 7.9])
+    assert vector.call_batch("square", [floats]).tolist() == [6.25, 7.9 * 7.9]
+    assert vector.call_batch("square", [[2**70]]) == scalar.call_batch("square", [[2**70]])
+    assert vector.call_batch("square", [np.array([2**63], dtype=np.uint64)]).tolist() == [2**126]